@@ -6,39 +6,51 @@ import sys
 from typing import Optional, TextIO
 
 import click
-from rich.console import Console
-from rich.logging import RichHandler
-from rich.progress import Progress, SpinnerColumn, TextColumn, TimeElapsedColumn
 
 from . import __version__
 from .core.banner import get_banner
 from .core.combinator import FileCombinator
 from .core.config import get_config
-from .core.console import (
-    create_file_table,
-    create_stats_panel,
-    print_banner,
-    print_error,
-    print_success,
-    print_warning,
-)
 from .core.exceptions import FileCombinatorError
 
 logger = logging.getLogger(__name__)
 
+# Prefixes of status messages; Rich is only imported for styled output
+_STATUS_PREFIXES = {"success": "✓ ", "warning": "⚠ ", "error": "✗ "}
+
+
+def print_status(kind: str, message: str, style: bool = True) -> None:
+    """Print a success, warning or error message.
+
+    Args:
+        kind: "success", "warning" or "error"
+        message: Message to display
+        style: Whether to use Rich styling
+    """
+    if style:
+        from .core import console
+
+        getattr(console, f"print_{kind}")(message)
+        return
+
+    stream = sys.stderr if kind == "error" else sys.stdout
+    stream.write(f"{_STATUS_PREFIXES[kind]}{message}\n")
+
 
 def setup_logging(verbose: bool = False, style: bool = True) -> None:
     """Set up logging with Rich formatting."""
-    log_handler = (
-        RichHandler(
+    log_handler: logging.Handler
+    if style:
+        from rich.logging import RichHandler
+
+        log_handler = RichHandler(
             rich_tracebacks=True,
             markup=style,
             show_time=False,
             show_path=False,
         )
-        if style
-        else logging.StreamHandler(sys.stderr)
-    )
+    else:
+        log_handler = logging.StreamHandler(sys.stderr)
 
     log_handler.setFormatter(logging.Formatter("%(message)s"))
 
@@ -66,35 +78,39 @@ def display_summary(
     stats = combinator.stats
     file_lists = combinator.file_lists
 
-    print_success("\nProcessing completed!")
+    print_status("success", "\nProcessing completed!", style)
 
     if style:
+        from rich.console import Console
+
+        from .core.console import create_file_table, create_stats_panel
+
         console = Console()
         console.print(create_stats_panel(stats, output_file))
 
-        if stats.processed > 0:
-            console.print(
-                create_file_table(file_lists.text, "Text Files Processed", max_files)
-            )
-        if stats.binary > 0:
-            console.print(
-                create_file_table(file_lists.binary, "Binary Files Detected", max_files)
-            )
-        if stats.image > 0:
-            console.print(
-                create_file_table(file_lists.image, "Image Files Detected", max_files)
-            )
+        for count, files, title in (
+            (stats.processed, file_lists.text, "Text Files Processed"),
+            (stats.binary, file_lists.binary, "Binary Files Detected"),
+            (stats.image, file_lists.image, "Image Files Detected"),
+        ):
+            if count > 0:
+                # Only the displayed rows are handed to Rich
+                console.print(
+                    create_file_table(files[:max_files], title, total=len(files))
+                )
     else:
         # Fallback for non-styled output
-        print("\nStatistics:")
-        print(f"Text files processed: {stats.processed}")
-        print(f"Binary files detected: {stats.binary}")
-        print(f"Image files detected: {stats.image}")
-        print(f"Files skipped: {stats.skipped}")
-        print(f"Output written to: {output_file}")
+        sys.stdout.write(
+            "\nStatistics:\n"
+            f"Text files processed: {stats.processed}\n"
+            f"Binary files detected: {stats.binary}\n"
+            f"Image files detected: {stats.image}\n"
+            f"Files skipped: {stats.skipped}\n"
+            f"Output written to: {output_file}\n"
+        )
 
     if stats.skipped > 0:
-        print_warning(f"Skipped {stats.skipped} files due to errors")
+        print_status("warning", f"Skipped {stats.skipped} files due to errors", style)
 
 
 def process_directory(
@@ -103,23 +119,29 @@ def process_directory(
     exclude: tuple[str, ...],
     verbose: bool,
     style: bool = True,
+    durable: bool = False,
 ) -> None:
     """Process directory and generate output."""
     combinator = FileCombinator(
         additional_excludes=set(exclude) if exclude else None,
         verbose=verbose,
         output_file=output,
+        durable=durable,
     )
 
-    with Progress(
-        SpinnerColumn(),
-        TextColumn("[progress.description]{task.description}"),
-        TimeElapsedColumn(),
-        disable=not style or not sys.stdout.isatty(),
-    ) as progress:
-        task = progress.add_task("Processing files...", total=None)
+    if not style or not sys.stdout.isatty():
         combinator.process_directory(directory, output)
-        progress.update(task, completed=True)
+    else:
+        from rich.progress import Progress, SpinnerColumn, TextColumn, TimeElapsedColumn
+
+        with Progress(
+            SpinnerColumn(),
+            TextColumn("[progress.description]{task.description}"),
+            TimeElapsedColumn(),
+        ) as progress:
+            task = progress.add_task("Processing files...", total=None)
+            combinator.process_directory(directory, output)
+            progress.update(task, completed=True)
 
     display_summary(combinator, output, style)
 
@@ -146,6 +168,9 @@ def process_directory(
 )
 @click.option("-v", "--verbose", is_flag=True, help="Enable verbose output")
 @click.option("--style/--no-style", default=True, help="Enable/disable rich styling")
+@click.option(
+    "--durable", is_flag=True, help="Sync the output file to disk before finishing"
+)
 @click.version_option(version=__version__, prog_name="FileCombinator")
 def main(
     directory: str,
@@ -153,6 +178,7 @@ def main(
     exclude: tuple[str, ...],
     verbose: bool,
     style: bool,
+    durable: bool,
 ) -> None:
     """Combine multiple files while preserving directory structure."""
     try:
@@ -160,6 +186,8 @@ def main(
             raise FileCombinatorError(f"Directory not found: {directory}")
 
         if style:
+            from .core.console import print_banner
+
             print_banner(get_banner())
 
         setup_logging(verbose, style)
@@ -173,16 +201,16 @@ def main(
             output = f"{output}{suffix}"
 
         if not check_output_file(output):
-            print_warning("Operation cancelled by user")
+            print_status("warning", "Operation cancelled by user", style)
             sys.exit(0)
 
-        process_directory(directory, output, exclude, verbose, style)
+        process_directory(directory, output, exclude, verbose, style, durable)
 
     except FileCombinatorError as e:
-        print_error(str(e))
+        print_status("error", str(e), style)
         sys.exit(2)
     except Exception as e:
-        print_error(f"Unexpected error: {str(e)}")
+        print_status("error", f"Unexpected error: {str(e)}", style)
         if verbose:
             logger.exception("Detailed error information:")
         sys.exit(2)
@@ -5,30 +5,43 @@ import atexit
 import contextlib
 import logging
 import os
-import shutil
+import sys
 import tempfile
 import time
-import weakref
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
-from typing import TextIO, cast
+from typing import AbstractSet, BinaryIO, Iterable, cast
 
 from ..processors.content import ContentProcessor
 from ..processors.directory import DirectoryProcessor
 from .config import get_config
 from .exceptions import FileCombinatorError
+from .file_utils import CachedEntry
 from .formatting import FormatProcessor
-from .models import FileLists, FileStats
+from .models import FileLists, FileSection, FileStats
 
 logger = logging.getLogger(__name__)
 
+# Rendering is I/O bound, so by default oversubscribe the CPUs with threads
+_MAX_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+
+# Write buffer for the temporary output file
+_OUTPUT_BUFFER_SIZE = 1024 * 1024
+
 
 class TempFileManager:
-    """Manages temporary files with proper cleanup."""
+    """Manages temporary files with proper cleanup.
+
+    Cleanup at interpreter exit is registered with ``atexit`` for the module's
+    global instance.
+    """
+
+    __slots__ = ("_temp_files",)
 
     def __init__(self) -> None:
         """Initialize the temporary file manager."""
         self._temp_files: set[str] = set()
-        weakref.finalize(self, self.cleanup_all)
 
     def register(self, filepath: str) -> None:
         """Register a temporary file for cleanup.
@@ -46,14 +59,22 @@ class TempFileManager:
         """
         self._temp_files.discard(filepath)
 
+    def cleanup(self, filepath: str) -> None:
+        """Clean up a single registered temporary file.
+
+        Args:
+            filepath: Path to the temporary file
+        """
+        with contextlib.suppress(OSError):
+            if os.path.exists(filepath):
+                os.unlink(filepath)
+                self._temp_files.discard(filepath)
+                logger.debug("Cleaned up temporary file: %s", filepath)
+
     def cleanup_all(self) -> None:
         """Clean up all registered temporary files."""
         for filepath in list(self._temp_files):
-            with contextlib.suppress(OSError):
-                if os.path.exists(filepath):
-                    os.unlink(filepath)
-                    self._temp_files.discard(filepath)
-                    logger.debug("Cleaned up temporary file: %s", filepath)
+            self.cleanup(filepath)
 
 
 # Global temporary file manager
@@ -71,6 +92,7 @@ class FileCombinator:
         additional_excludes: set[str] | None = None,
         verbose: bool = False,
         output_file: str | None = None,
+        durable: bool = False,
     ) -> None:
         """Initialize FileCombinator.
 
@@ -78,16 +100,22 @@ class FileCombinator:
             additional_excludes: Additional patterns to exclude
             verbose: Enable verbose logging
             output_file: Path to output file
+            durable: Flush the output to disk with fsync before publishing it
         """
         config = get_config(additional_excludes)
-        self.exclude_patterns = config.exclude_patterns
         self.verbose = verbose
         self.output_file = output_file
+        self.output_suffix = config.output_suffix
+        self.max_workers = config.max_workers or _MAX_WORKERS
+        self.durable = durable
         self.logger = logging.getLogger("FileCombinator")
 
         # Initialize processors
         self.directory_processor = DirectoryProcessor(
-            self.exclude_patterns, self.output_file
+            config.exclude_patterns,
+            self.output_file,
+            sort_by_inode=config.sort_by_inode,
+            output_suffix=config.output_suffix,
         )
         self.content_processor = ContentProcessor()
         self.format_processor = FormatProcessor()
@@ -107,14 +135,25 @@ class FileCombinator:
         self.logger.info("Starting directory processing: %s", directory)
 
         # Update output file for proper exclusion
+        abs_output_path = os.path.abspath(output_path)
         self.output_file = output_path
-        self.directory_processor.output_file = output_path
+        self.directory_processor.output_file = abs_output_path
+
+        # Create the temporary file next to the output, so that publishing it
+        # is an atomic rename instead of a copy across file systems
+        output_dir = os.path.dirname(abs_output_path)
+        try:
+            os.makedirs(output_dir, exist_ok=True)
+        except OSError as e:
+            self.logger.error("Error creating output directory: %s", e)
+            raise FileCombinatorError(f"Failed to create output directory: {e}") from e
 
         with tempfile.NamedTemporaryFile(
-            mode="w+",
-            suffix=get_config().output_suffix,  # Use configured suffix for temp files
+            mode="wb",
+            buffering=_OUTPUT_BUFFER_SIZE,
+            suffix=self.output_suffix,  # Excluded from processing by its suffix
+            dir=output_dir,
             delete=False,
-            encoding="utf-8",
         ) as temp_file:
             temp_name = temp_file.name
             _temp_manager.register(temp_name)
@@ -122,47 +161,82 @@ class FileCombinator:
             try:
                 self.logger.debug("Created temporary file: %s", temp_name)
 
-                output_dir = os.path.dirname(os.path.abspath(output_path))
-                if output_dir:
-                    os.makedirs(output_dir, exist_ok=True)
-
                 # Write AI instructions header
-                self.format_processor.write_header(cast(TextIO, temp_file))
+                self.format_processor.write_header(cast(BinaryIO, temp_file))
 
-                # Generate directory tree
-                tree_content = self.directory_processor.generate_tree(directory)
+                # Walk the directory once for both the tree and the files
+                tree_content, files = self.directory_processor.scan(directory)
                 self.format_processor.format_directory_tree(
-                    tree_content, cast(TextIO, temp_file)
+                    tree_content, cast(BinaryIO, temp_file)
                 )
 
                 # Process all files
-                def process_file(file_path: str) -> None:
-                    self.format_processor.format_file_section(
-                        file_path, cast(TextIO, temp_file)
-                    )
-                    self.content_processor.track_file(file_path)
-
-                self.directory_processor.process_directory(directory, process_file)
+                self._write_file_sections(files, cast(BinaryIO, temp_file))
 
                 temp_file.flush()
-                os.fsync(temp_file.fileno())
+                if self.durable:
+                    os.fsync(temp_file.fileno())
 
             except Exception as e:
                 self.logger.error("Fatal error during processing: %s", e)
+                temp_file.close()
+                _temp_manager.cleanup(temp_name)
                 raise FileCombinatorError(f"Failed to process directory: {e}") from e
 
-            try:
-                # Move temporary file to final location
-                shutil.move(temp_name, output_path)
-                _temp_manager.unregister(temp_name)
+        try:
+            # Move temporary file to final location
+            os.replace(temp_name, output_path)
+            _temp_manager.unregister(temp_name)
 
-                duration = time.time() - self.start_time if self.start_time else 0.0
-                self.logger.info("Processing completed in %.2f seconds", duration)
-                self._log_statistics(output_path)
+            duration = time.time() - self.start_time if self.start_time else 0.0
+            self.logger.info("Processing completed in %.2f seconds", duration)
+            self._log_statistics(output_path)
 
-            except Exception as e:
-                self.logger.error("Error finalizing output: %s", e)
-                raise FileCombinatorError(f"Failed to finalize output: {e}") from e
+        except Exception as e:
+            self.logger.error("Error finalizing output: %s", e)
+            raise FileCombinatorError(f"Failed to finalize output: {e}") from e
+
+    def _write_file_sections(
+        self, files: Iterable[CachedEntry], output: BinaryIO
+    ) -> None:
+        """Render file sections in parallel and write them in traversal order.
+
+        Worker threads read, classify and render each file into a
+        ``FileSection`` while the calling thread writes finished sections.
+        Sections are written and tracked in submission order, so the output and
+        the statistics are deterministic. At most twice ``max_workers``
+        sections are in flight at any time, which bounds memory use on large
+        trees.
+
+        Args:
+            files: Entries of the files to process, in output order
+            output: Output file to write to
+
+        Raises:
+            FileProcessingError: If a file cannot be processed
+        """
+        render = self.format_processor.render_file_section
+
+        def write_next() -> None:
+            entry, future = pending.popleft()
+            section = future.result()
+            self.format_processor.write_file_section(section, output)
+            self.content_processor.track_file(entry, section.file_type)
+
+        pending: deque[tuple[CachedEntry, Future[FileSection]]] = deque()
+        window = 2 * self.max_workers
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            try:
+                for entry in files:
+                    pending.append((entry, executor.submit(render, entry)))
+                    if len(pending) >= window:
+                        write_next()
+                while pending:
+                    write_next()
+            except BaseException:
+                for _, future in pending:
+                    future.cancel()
+                raise
 
     def _log_statistics(self, output_path: str) -> None:
         """Log processing statistics.
@@ -171,23 +245,41 @@ class FileCombinator:
             output_path: Path to output file
         """
         stats = self.stats
-        self.logger.info("Text files processed: %d", stats.processed)
-        self.logger.info("Binary files detected: %d", stats.binary)
-        self.logger.info("Image files detected: %d", stats.image)
-        self.logger.info("Files skipped due to errors: %d", stats.skipped)
-        self.logger.info("Output written to: %s", output_path)
+        self.logger.info(
+            "Text files processed: %d\n"
+            "Binary files detected: %d\n"
+            "Image files detected: %d\n"
+            "Files skipped due to errors: %d\n"
+            "Output written to: %s",
+            stats.processed,
+            stats.binary,
+            stats.image,
+            stats.skipped,
+            output_path,
+        )
 
     def _print_excluded_files(self) -> None:
         """Print information about excluded files."""
         file_lists = self.file_lists
+        lines: list[str] = []
         for file_type, files in [
             ("Binary", file_lists.binary),
             ("Image", file_lists.image),
         ]:
             if files:
-                print(f"\n{file_type} files detected and excluded:")
-                for file_name in files:
-                    print(f"  {file_name}")
+                lines.append(f"\n{file_type} files detected and excluded:\n")
+                lines.extend(f"  {file_name}\n" for file_name in files)
+        if lines:
+            sys.stdout.write("".join(lines))
+
+    @property
+    def exclude_patterns(self) -> AbstractSet[str]:
+        """Get the patterns excluded from processing.
+
+        Returns:
+            AbstractSet[str]: Compiled exclude patterns of the directory processor
+        """
+        return self.directory_processor.exclude_patterns
 
     @property
     def file_lists(self) -> FileLists:
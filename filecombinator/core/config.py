@@ -20,6 +20,8 @@ class Config:
     exclude_patterns: Set[str] = field(default_factory=set)
     log_file: str = "logs/file_combinator.log"
     output_suffix: str = "_file_combinator_output.txt"
+    sort_by_inode: bool = True
+    max_workers: int = 0  # 0 picks a default based on the CPU count
 
 
 def get_default_excludes() -> Set[str]:
@@ -84,6 +86,29 @@ def load_config_file(config_path: Optional[str] = None) -> Config:
                         "file_suffix", config.output_suffix
                     )
 
+            # Load traversal configuration
+            if "traversal" in config_dict:
+                traversal_config = config_dict["traversal"]
+                if isinstance(traversal_config, dict):
+                    config.sort_by_inode = bool(
+                        traversal_config.get("sort_by_inode", config.sort_by_inode)
+                    )
+
+            # Load processing configuration
+            if "processing" in config_dict:
+                processing_config = config_dict["processing"]
+                if isinstance(processing_config, dict):
+                    max_workers = processing_config.get(
+                        "max_workers", config.max_workers
+                    )
+                    if (
+                        not isinstance(max_workers, int)
+                        or isinstance(max_workers, bool)
+                        or max_workers < 0
+                    ):
+                        raise ValueError("max_workers must be a non-negative integer")
+                    config.max_workers = max_workers
+
             return config
 
     except OSError as e:
@@ -95,7 +95,10 @@ def create_stats_panel(stats: FileStats, output_file: str) -> Panel:
 
 
 def create_file_table(
-    files: List[str], file_type: str, max_files: Optional[int] = None
+    files: List[str],
+    file_type: str,
+    max_files: Optional[int] = None,
+    total: Optional[int] = None,
 ) -> Table:
     """Create a Rich table displaying processed files.
 
@@ -103,6 +106,8 @@ def create_file_table(
         files: List of file paths
         file_type: Type of files being displayed
         max_files: Optional maximum number of files to display
+        total: Optional total number of files, when ``files`` holds only the
+            rows to display
 
     Returns:
         Rich Table containing file information
@@ -122,8 +127,8 @@ def create_file_table(
     for file_path in display_files:
         table.add_row(file_path, "✓ Processed")
 
-    if max_files and len(files) > max_files:
-        remaining = len(files) - max_files
+    remaining = (len(files) if total is None else total) - len(display_files)
+    if remaining > 0:
         table.add_row("... and " + str(remaining) + " more files", style="dim italic")
 
     return table
@@ -3,11 +3,12 @@
 
 from __future__ import annotations
 
+import codecs
 import logging
+import mmap
 import os
 from pathlib import Path
-from types import TracebackType
-from typing import Any, Optional, Set, Type
+from typing import Any, BinaryIO, Iterator, Optional, Set
 
 from .exceptions import FileProcessingError
 
@@ -25,65 +26,275 @@ except ImportError:  # pragma: no cover
     )
 
 
-class SafeOpen:
-    """Context manager for safely opening files with proper resource management."""
+# Number of leading bytes inspected by content-based type detection
+PROBE_SIZE = 8192
+
+# Chunk size for user-space copies of file bodies
+_COPY_CHUNK_SIZE = 1024 * 1024
+
+# Bodies above this size are read through a memory map
+_MMAP_THRESHOLD = 256 * 1024
+
+# Files above this size are dropped from the page cache once copied
+_DROP_CACHE_THRESHOLD = 1024 * 1024
+
+# Number of MIME types cached per detector
+_MIME_CACHE_SIZE = 8192
+
+# Flags for raw read-only descriptors
+READ_FLAGS = os.O_RDONLY | getattr(os, "O_BINARY", 0) | getattr(os, "O_CLOEXEC", 0)
+
+
+def pread(fd: int, size: int, offset: int) -> bytes:
+    """Read bytes at an offset, without moving the file offset where possible.
+
+    Args:
+        fd: File descriptor to read from
+        size: Maximum number of bytes to read
+        offset: Position in the file to read from
+
+    Returns:
+        bytes: The data read, empty at end of file
+
+    Raises:
+        OSError: If the descriptor cannot be read
+    """
+    if hasattr(os, "pread"):
+        return os.pread(fd, size, offset)
+    os.lseek(fd, offset, os.SEEK_SET)  # pragma: no cover
+    return os.read(fd, size)  # pragma: no cover
+
+
+def file_extension(name: str) -> str:
+    """Get the lower-cased extension of a file name.
+
+    Matches ``os.path.splitext`` (leading dots do not start an extension)
+    with a single ``rfind`` instead of a scan in Python.
+
+    Args:
+        name: Base name of the file
+
+    Returns:
+        str: Extension including the dot, or an empty string
+    """
+    dot = name.rfind(".")
+    if dot <= 0 or not name[:dot].lstrip("."):
+        return ""
+    return name[dot:].lower()
+
+
+def fadvise(fd: int, offset: int, length: int, advice: str) -> None:
+    """Give the kernel an access pattern hint for a file, where supported.
+
+    Hints are best effort: platforms without ``posix_fadvise`` and errors
+    are ignored.
+
+    Args:
+        fd: File descriptor the hint applies to
+        offset: Start of the region
+        length: Length of the region, 0 meaning up to the end of the file
+        advice: Name of the ``os.POSIX_FADV_*`` constant, without the prefix
+    """
+    if not hasattr(os, "posix_fadvise"):  # pragma: no cover
+        return
+    try:
+        os.posix_fadvise(fd, offset, length, getattr(os, f"POSIX_FADV_{advice}"))
+    except OSError as e:  # pragma: no cover
+        logger.debug("posix_fadvise(%s) failed: %s", advice, e)
+
+
+def normalize_text(content: bytes) -> bytes:
+    """Validate UTF-8 text and translate its newlines as text mode reads do.
+
+    Args:
+        content: Raw file content
+
+    Returns:
+        bytes: Content with CRLF and CR line endings replaced by LF
+
+    Raises:
+        UnicodeDecodeError: If the content is not valid UTF-8
+    """
+    content.decode("utf-8")
+    if b"\r" in content:
+        content = content.replace(b"\r\n", b"\n").replace(b"\r", b"\n")
+    return content
+
+
+def _read_chunks(fd: int, size: int) -> Iterator[bytes]:
+    """Read a file in chunks from the start up to end of file.
+
+    Files larger than 256 KiB are sliced from a read-only memory map, copying
+    each chunk straight from the page cache without a read call. Files that
+    cannot be mapped, and anything appended after the map was created, are
+    read with plain reads.
+
+    Args:
+        fd: Descriptor of the file, at offset 0
+        size: Size of the file in bytes when it was opened
+
+    Yields:
+        bytes: Consecutive chunks of at most ``_COPY_CHUNK_SIZE`` bytes
+
+    Raises:
+        OSError: If the file cannot be read
+    """
+    if size > _MMAP_THRESHOLD:
+        try:
+            mapped = mmap.mmap(fd, 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError) as e:
+            logger.debug("mmap unavailable for descriptor %d: %s", fd, e)
+        else:
+            with mapped:
+                if hasattr(mapped, "madvise"):
+                    mapped.madvise(mmap.MADV_SEQUENTIAL)
+                for offset in range(0, len(mapped), _COPY_CHUNK_SIZE):
+                    yield mapped[offset : offset + _COPY_CHUNK_SIZE]
+                os.lseek(fd, len(mapped), os.SEEK_SET)
+    while chunk := os.read(fd, _COPY_CHUNK_SIZE):
+        yield chunk
+
+
+def copy_normalized_text(src_path: str, output: BinaryIO) -> None:
+    """Copy a text file through normalize_text() in chunks, up to end of file.
+
+    Validation and newline translation happen in the same single read as the
+    copy. Characters split between chunks are carried over to the next one,
+    and a CRLF pair split between chunks is written as a single LF, so the
+    result is the same as normalizing the whole body at once. The file is read
+    from a raw descriptor with sequential access and readahead hints, through a
+    memory map above 256 KiB, and files larger than 1 MiB are dropped from the
+    page cache afterwards, as they are not read again.
+
+    Args:
+        src_path: Path to the file to copy
+        output: Binary stream to write to
+
+    Raises:
+        OSError: If the file cannot be read or the stream written
+        UnicodeDecodeError: If the content is not valid UTF-8
+    """
+    pending = b""
+    after_cr = False
+    size = 0
+    fd = os.open(src_path, READ_FLAGS)
+    try:
+        size = os.fstat(fd).st_size
+        fadvise(fd, 0, 0, "SEQUENTIAL")
+        fadvise(fd, 0, size, "WILLNEED")
+        for chunk in _read_chunks(fd, size):
+            if pending or not chunk.isascii():
+                data = pending + chunk
+                consumed = codecs.utf_8_decode(data, "strict", False)[1]
+                chunk, pending = data[:consumed], data[consumed:]
+            if after_cr and chunk.startswith(b"\n"):
+                chunk = chunk[1:]
+                after_cr = False
+            if chunk:
+                after_cr = chunk.endswith(b"\r")
+                output.write(chunk.replace(b"\r\n", b"\n").replace(b"\r", b"\n"))
+    finally:
+        if size > _DROP_CACHE_THRESHOLD:
+            fadvise(fd, 0, size, "DONTNEED")
+        os.close(fd)
+    codecs.utf_8_decode(pending, "strict", True)
+
+
+class CachedEntry:
+    """File entry that performs at most one stat call during its lifetime.
+
+    Every consumer in the processing pipeline (exclusion filters, type
+    detection, metadata formatting) shares the memoized stat result instead of
+    hitting the filesystem again. Symlinks are followed, matching ``os.stat``;
+    on Linux the underlying call is ``statx``, so its synchronization semantics
+    are whatever the kernel path chosen by the C library provides.
+    """
+
+    __slots__ = ("path", "name", "_entry", "_stat", "_extension")
 
     def __init__(
-        self,
-        file_path: str | Path,
-        mode: str = "r",
-        encoding: str = "utf-8",
-        **kwargs: Any,
+        self, file_path: str | Path, entry: Optional[os.DirEntry[str]] = None
     ) -> None:
-        """Initialize the context manager with proper encoding by default.
+        """Initialize the entry.
 
         Args:
-            file_path: Path to the file to open
-            mode: File mode (e.g., 'r', 'w', 'rb')
-            encoding: Character encoding for text files
-            **kwargs: Additional arguments to pass to open()
+            file_path: Path to the file
+            entry: Optional directory entry produced by ``os.scandir``
         """
-        self.file_path = file_path
-        self.mode = mode
-        self.kwargs = kwargs
-        if "b" not in mode:
-            self.kwargs["encoding"] = encoding
-        self.file_obj: Any = None
+        self.path = os.fspath(file_path)
+        self.name = entry.name if entry is not None else os.path.basename(self.path)
+        self._entry = entry
+        self._stat: Optional[os.stat_result] = None
+        self._extension: Optional[str] = None
 
-    def __enter__(self) -> Any:
-        """Open and return the file object with proper encoding.
+    @classmethod
+    def from_dir_entry(cls, entry: os.DirEntry[str]) -> CachedEntry:
+        """Wrap a directory entry produced by ``os.scandir``.
+
+        Args:
+            entry: Directory entry to wrap
+
+        Returns:
+            CachedEntry: Entry sharing the directory entry's cached data
+        """
+        return cls(entry.path, entry)
+
+    @classmethod
+    def of(cls, file_path: str | Path | CachedEntry) -> CachedEntry:
+        """Return a cached entry for a path, reusing an existing entry.
+
+        Args:
+            file_path: Path or cached entry
 
         Returns:
-            File object
+            CachedEntry: Entry for the given path
+        """
+        if isinstance(file_path, CachedEntry):
+            return file_path
+        return cls(file_path)
+
+    def stat(self) -> os.stat_result:
+        """Get the stat result of the file, calling stat only once.
+
+        Returns:
+            os.stat_result: Stat result of the file
 
         Raises:
-            IOError: If file cannot be opened
+            OSError: If the file cannot be stat'ed
         """
-        try:
-            self.file_obj = open(self.file_path, self.mode, **self.kwargs)
-            return self.file_obj
-        except IOError as e:
-            logger.error("Failed to open file %s: %s", self.file_path, e)
-            raise
-
-    def __exit__(
-        self,
-        exc_type: Optional[Type[BaseException]],
-        exc_val: Optional[BaseException],
-        exc_tb: Optional[TracebackType],
-    ) -> None:
-        """Close the file object even if an exception occurred.
+        if self._stat is None:
+            if self._entry is not None:
+                self._stat = self._entry.stat()
+            else:
+                self._stat = os.stat(self.path)
+        return self._stat
+
+    @property
+    def extension(self) -> str:
+        """Get the lower-cased extension of the file name, computed once."""
+        if self._extension is None:
+            self._extension = file_extension(self.name)
+        return self._extension
+
+    def exists(self) -> bool:
+        """Check if the file exists.
 
-        Args:
-            exc_type: Exception type if an exception occurred
-            exc_val: Exception value if an exception occurred
-            exc_tb: Exception traceback if an exception occurred
+        Returns:
+            bool: True if the file can be stat'ed, False otherwise
         """
-        if self.file_obj is not None:
-            try:
-                self.file_obj.close()
-            except Exception as e:  # pragma: no cover
-                logger.warning("Error closing file %s: %s", self.file_path, e)
+        try:
+            self.stat()
+        except OSError:
+            return False
+        return True
+
+    def __fspath__(self) -> str:
+        """Return the file system path of the entry."""
+        return self.path
+
+    def __repr__(self) -> str:
+        """Return a debug representation of the entry."""
+        return f"CachedEntry({self.path!r})"
 
 
 class FileTypeDetector:
@@ -116,6 +327,7 @@ class FileTypeDetector:
         ".pkl",
         ".pdb",
         ".o",
+        ".a",
         ".obj",
         ".db",
         ".sqlite",
@@ -124,6 +336,14 @@ class FileTypeDetector:
         ".war",
         ".class",
         ".pdf",
+        ".zip",
+        ".gz",
+        ".bz2",
+        ".xz",
+        ".7z",
+        ".mp3",
+        ".mp4",
+        ".mov",
     }
 
     # Known text file extensions
@@ -160,6 +380,7 @@ class FileTypeDetector:
 
     def __init__(self) -> None:
         """Initialize the FileTypeDetector."""
+        self._mime_cache: dict[tuple[int, int, int, int, bool], str] = {}
         self.mime: Optional[Any] = None
         if MAGIC_AVAILABLE:
             try:
@@ -169,11 +390,16 @@ class FileTypeDetector:
                 logger.debug("Could not initialize magic library: %s", e)
                 self.mime = None
 
-    def _check_for_binary_content(self, chunk: bytes) -> bool:
+    def _check_for_binary_content(self, chunk: bytes, final: bool) -> bool:
         """Check if content chunk appears to be binary.
 
+        Pure ASCII chunks are accepted without decoding. A chunk cut from a
+        longer file may end inside a multi-byte character, so an incomplete
+        trailing sequence is only an error when the chunk is the whole file.
+
         Args:
             chunk: Bytes to check
+            final: Whether the chunk holds the whole file
 
         Returns:
             bool: True if content appears binary, False otherwise
@@ -187,16 +413,23 @@ class FileTypeDetector:
             logger.debug("Found null bytes in content")
             return True
 
+        if chunk.isascii():
+            return False
+
         # Try to decode as text
         try:
-            chunk.decode("utf-8", errors="strict")
+            codecs.utf_8_decode(chunk, "strict", final)
             return False
         except UnicodeDecodeError:
             logger.debug("Content failed UTF-8 decoding")
             return True
 
     def _read_file_chunk(self, file_path: str) -> bytes:
-        """Read a chunk of file content safely.
+        """Read the leading chunk of a file used for content analysis.
+
+        The chunk is read with a single ``pread`` on a raw descriptor, without
+        building a buffered Python file object, after hinting sequential
+        access to the kernel.
 
         Args:
             file_path: Path to the file to read
@@ -208,36 +441,196 @@ class FileTypeDetector:
             FileProcessingError: If there's an error reading the file
         """
         try:
-            with open(file_path, "rb") as f:
-                return f.read(8192)
+            fd = os.open(file_path, READ_FLAGS)
+            try:
+                fadvise(fd, 0, PROBE_SIZE, "SEQUENTIAL")
+                return pread(fd, PROBE_SIZE, 0)
+            finally:
+                os.close(fd)
         except IOError as e:
             logger.error("Error reading file %s: %s", file_path, e)
             raise FileProcessingError(f"Error reading file {file_path}: {e}")
 
-    def is_image_file(self, file_path: str | Path) -> bool:
+    def _mime_type(self, entry: CachedEntry, header: Optional[bytes]) -> str:
+        """Get the MIME type of a file, from its header when already read.
+
+        Results are cached by device, inode, modification time and size, so
+        each unchanged physical file is parsed by libmagic at most once per
+        detector and source, whichever path or check asks for it. Answers from
+        the header alone and from the whole file are cached separately, so
+        neither depends on which kind of check ran first.
+
+        Args:
+            entry: Cached entry of the file
+            header: Leading bytes of the file, or None to read the file
+
+        Returns:
+            str: Detected MIME type
+
+        Raises:
+            OSError: If the file cannot be stat'ed
+        """
+        assert self.mime is not None
+        stat = entry.stat()
+        key = (
+            stat.st_dev,
+            stat.st_ino,
+            stat.st_mtime_ns,
+            stat.st_size,
+            header is not None,
+        )
+        mime_type = self._mime_cache.get(key) if stat.st_ino else None
+        if mime_type is None:
+            if header is not None:
+                mime_type = str(self.mime.from_buffer(header))
+            else:
+                mime_type = str(self.mime.from_file(entry.path))
+            if stat.st_ino:
+                if len(self._mime_cache) >= _MIME_CACHE_SIZE:
+                    self._mime_cache.clear()
+                self._mime_cache[key] = mime_type
+        return mime_type
+
+    def _is_text_mime(self, mime_type: str) -> bool:
+        """Check if a MIME type denotes text content.
+
+        Args:
+            mime_type: MIME type to check
+
+        Returns:
+            bool: True if the MIME type is a known text type
+        """
+        return mime_type.startswith(tuple(self.TEXT_MIME_TYPES))
+
+    def _analyze_content(self, entry: CachedEntry, header: Optional[bytes]) -> bool:
+        """Check if the leading chunk of a file appears to be binary.
+
+        Args:
+            entry: Cached entry of the file
+            header: Leading ``PROBE_SIZE`` bytes of the file if already read
+
+        Returns:
+            bool: True if the content appears binary, False otherwise
+
+        Raises:
+            FileProcessingError: If there's an error reading the file
+        """
+        try:
+            chunk = header if header is not None else self._read_file_chunk(entry.path)
+            final = entry.stat().st_size <= PROBE_SIZE
+            return self._check_for_binary_content(chunk, final)
+        except Exception as e:
+            logger.error("Error during binary detection: %s", e, exc_info=True)
+            raise FileProcessingError(f"Error reading file {entry.path}: {e}")
+
+    def detect_by_extension(self, file_path: str | Path | CachedEntry) -> Optional[str]:
+        """Classify a file by its extension alone, as detect_file_type() does.
+
+        Plain ``.txt`` files are always checked by content, so their extension
+        is never conclusive.
+
+        Args:
+            file_path: Path or cached entry of the file to check
+
+        Returns:
+            Optional[str]: "Image", "Binary" or "Text", or None if the extension
+            is not conclusive
+        """
+        extension = CachedEntry.of(file_path).extension
+        if extension in self.IMAGE_EXTENSIONS:
+            return "Image"
+        if extension in self.BINARY_EXTENSIONS:
+            return "Binary"
+        if extension != ".txt" and extension in self.TEXT_EXTENSIONS:
+            return "Text"
+        return None
+
+    def detect_file_type(
+        self, file_path: str | Path | CachedEntry, header: Optional[bytes] = None
+    ) -> str:
+        """Detect whether a file is a text, binary or image file.
+
+        Detection is a single pass over the cached stat result and the
+        extension: known image and binary extensions are classified without
+        opening the file, known text extensions without consulting libmagic,
+        and the MIME type of any other file is looked up at most once.
+
+        Args:
+            file_path: Path or cached entry of the file to check
+            header: Leading ``PROBE_SIZE`` bytes of the file if the caller has
+                already read them, so the file is not opened again
+
+        Returns:
+            str: "Text", "Binary" or "Image"
+
+        Raises:
+            FileProcessingError: If there's an error reading the file
+        """
+        entry = CachedEntry.of(file_path)
+        extension = entry.extension
+        if extension in self.IMAGE_EXTENSIONS:
+            return "Image"
+        if extension in self.BINARY_EXTENSIONS:
+            return "Binary"
+
+        if not entry.exists():
+            logger.error("File does not exist: %s", entry.path)
+            raise FileProcessingError(f"File does not exist: {entry.path}")
+        if entry.stat().st_size == 0:
+            return "Text"
+
+        # Plain .txt files are always checked by content
+        if extension == ".txt":
+            return "Binary" if self._analyze_content(entry, header) else "Text"
+        if extension in self.TEXT_EXTENSIONS:
+            return "Text"
+
+        mime_type: Optional[str] = None
+        if self.mime:
+            try:
+                mime_type = self._mime_type(entry, header)
+            except Exception as e:
+                logger.warning("Error checking mime type for %s: %s", entry.path, e)
+        if mime_type is not None and self._is_text_mime(mime_type):
+            return "Text"
+        if self._analyze_content(entry, header):
+            return "Binary"
+        if mime_type is not None and mime_type.startswith("image/"):
+            return "Image"
+        return "Text"
+
+    def is_image_file(
+        self, file_path: str | Path | CachedEntry, header: Optional[bytes] = None
+    ) -> bool:
         """Check if a file is an image.
 
         Args:
-            file_path: Path to the file to check
+            file_path: Path or cached entry of the file to check
+            header: Leading bytes of the file if already read
 
         Returns:
             bool: True if the file is an image, False otherwise
         """
-        file_path_str = str(file_path)
-        if not os.path.exists(file_path_str):
-            logger.debug("File %s does not exist", file_path_str)
-            return False
+        entry = CachedEntry.of(file_path)
+        file_path_str = entry.path
 
-        # Check extension first
-        extension = Path(file_path_str).suffix.lower()
+        # The extension is authoritative when known; libmagic is only
+        # consulted for unknown extensions
+        extension = entry.extension
         if extension in self.IMAGE_EXTENSIONS:
             logger.debug("File %s identified as image by extension", file_path_str)
             return True
+        if extension in self.BINARY_EXTENSIONS or extension in self.TEXT_EXTENSIONS:
+            return False
+
+        if not entry.exists():
+            logger.debug("File %s does not exist", file_path_str)
+            return False
 
         # Try MIME type detection
         if self.mime:
             try:
-                mime_type = self.mime.from_file(file_path_str)
+                mime_type = self._mime_type(entry, header)
                 if mime_type.startswith("image/"):
                     logger.debug(
                         "File %s identified as image by MIME type", file_path_str
@@ -248,11 +641,14 @@ class FileTypeDetector:
 
         return False
 
-    def is_binary_file(self, file_path: str | Path) -> bool:
+    def is_binary_file(
+        self, file_path: str | Path | CachedEntry, header: Optional[bytes] = None
+    ) -> bool:
         """Detect if a file is binary.
 
         Args:
-            file_path: Path to the file to check
+            file_path: Path or cached entry of the file to check
+            header: Leading ``PROBE_SIZE`` bytes of the file if already read
 
         Returns:
             bool: True if the file is binary, False otherwise
@@ -260,49 +656,61 @@ class FileTypeDetector:
         Raises:
             FileProcessingError: If there's an error reading the file
         """
-        file_path_str = str(file_path)
-        logger.debug("Checking if file is binary: %s", file_path_str)
+        entry = CachedEntry.of(file_path)
+        file_path_str = entry.path
+        # Called for every file: skip building debug records when filtered out
+        debug = logger.isEnabledFor(logging.DEBUG)
 
-        if not os.path.exists(file_path_str):
+        if not entry.exists():
             logger.error("File does not exist: %s", file_path_str)
             raise FileProcessingError(f"File does not exist: {file_path_str}")
 
+        size = entry.stat().st_size
+        extension = entry.extension
+        if debug:
+            logger.debug(
+                "Checking if file is binary: %s (%d bytes, extension %r)",
+                file_path_str,
+                size,
+                extension,
+            )
+
         # Empty files are treated as text files
-        size = os.path.getsize(file_path_str)
-        logger.debug("File size: %d bytes", size)
         if size == 0:
-            logger.debug("Empty file %s treated as text", file_path_str)
+            if debug:
+                logger.debug("Empty file %s treated as text", file_path_str)
             return False
 
         # For .txt files, always check content regardless of MIME type
-        extension = Path(file_path_str).suffix.lower()
-        logger.debug("File extension: %s", extension)
-        if extension == ".txt":
-            logger.debug("Text file found, will check content regardless of MIME type")
-        else:
+        if extension != ".txt":
             # For non-txt files, check known extensions first
             if extension in self.TEXT_EXTENSIONS:
-                logger.debug("File %s identified as text by extension", file_path_str)
+                if debug:
+                    logger.debug(
+                        "File %s identified as text by extension", file_path_str
+                    )
                 return False
             if extension in self.BINARY_EXTENSIONS:
-                logger.debug("File %s identified as binary by extension", file_path_str)
+                if debug:
+                    logger.debug(
+                        "File %s identified as binary by extension", file_path_str
+                    )
                 return True
 
             # Then try MIME type detection
             if self.mime:
                 try:
-                    mime_type = self.mime.from_file(file_path_str)
+                    mime_type = self._mime_type(entry, header)
                     logger.debug("MIME type for %s: %s", file_path_str, mime_type)
 
                     # Check for text MIME types
-                    for text_mime in self.TEXT_MIME_TYPES:
-                        if mime_type.startswith(text_mime):
-                            logger.debug(
-                                "File %s identified as text by MIME type %s",
-                                file_path_str,
-                                mime_type,
-                            )
-                            return False
+                    if self._is_text_mime(mime_type):
+                        logger.debug(
+                            "File %s identified as text by MIME type %s",
+                            file_path_str,
+                            mime_type,
+                        )
+                        return False
                     logger.debug("No matching text MIME type found")
                 except Exception as e:
                     logger.warning(
@@ -311,16 +719,11 @@ class FileTypeDetector:
 
         # For .txt files and files not identified by extension or MIME type,
         # check content
-        logger.debug("Performing content analysis")
-        try:
-            chunk = self._read_file_chunk(file_path_str)
-            is_binary = self._check_for_binary_content(chunk)
+        is_binary = self._analyze_content(entry, header)
+        if debug:
             logger.debug(
                 "Content analysis result for %s: %s",
                 file_path_str,
                 "binary" if is_binary else "text",
             )
-            return is_binary
-        except Exception as e:
-            logger.error("Error during binary detection: %s", e, exc_info=True)
-            raise FileProcessingError(f"Error reading file {file_path_str}: {e}")
+        return is_binary
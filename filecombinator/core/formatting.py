@@ -5,13 +5,42 @@ import logging
 import os
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, TextIO
+from typing import BinaryIO, Dict
 
 from ..core.exceptions import FileProcessingError
-from ..core.file_utils import FileTypeDetector, SafeOpen
+from ..core.file_utils import (
+    PROBE_SIZE,
+    READ_FLAGS,
+    CachedEntry,
+    FileTypeDetector,
+    copy_normalized_text,
+    fadvise,
+    normalize_text,
+    pread,
+)
+from ..core.models import FileSection
 
 logger = logging.getLogger(__name__)
 
+# Pre-encoded names of detected file types
+_TYPE_BYTES = {"Text": b"Text", "Binary": b"Binary", "Image": b"Image"}
+
+# Section heading and metadata, filled with bytes formatting per file
+_FILE_HEAD_TEMPLATE = (
+    b"\n## File: `%s`\n\n"
+    b"**Metadata**:\n\n"
+    b"- **Type**: %s\n"
+    b"- **Size**: %d bytes\n"
+    b"- **Last Modified**: %s\n\n"
+)
+
+# Text bodies above this size are streamed into the output instead of read
+STREAM_THRESHOLD = 64 * 1024
+
+# Pre-encoded endings of file sections
+_SECTION_END = b"\n\n---\n"
+_CODE_SECTION_END = b"\n`````" + _SECTION_END
+
 
 class FormatProcessor:
     """Handles formatting of FileCombinator output."""
@@ -50,19 +79,19 @@ class FormatProcessor:
         }
         self.file_type_detector = FileTypeDetector()
 
-    def detect_language(self, file_path: str | Path) -> str:
+    def detect_language(self, file_path: str | Path | CachedEntry) -> str:
         """Detect programming language based on file extension.
 
         Args:
-            file_path: Path to the file
+            file_path: Path or cached entry of the file
 
         Returns:
             str: Language identifier for syntax highlighting
         """
-        ext = os.path.splitext(str(file_path))[1].lower()
+        ext = CachedEntry.of(file_path).extension
         return self.extension_to_language.get(ext, "text")
 
-    def write_header(self, output: TextIO) -> None:
+    def write_header(self, output: BinaryIO) -> None:
         """Write AI instructions header to output.
 
         Args:
@@ -75,82 +104,182 @@ class FormatProcessor:
             template_path = os.path.join(
                 os.path.dirname(__file__), "templates", "ai_instructions.md"
             )
-            with SafeOpen(template_path, "r") as f:
+            with open(template_path, "rb") as f:
                 output.write(f.read())
         except (IOError, OSError) as e:
             logger.error("Failed to read AI instructions template: %s", e)
             raise FileProcessingError(f"Failed to read AI instructions: {e}") from e
 
-    def format_file_section(self, file_path: str | Path, output: TextIO) -> None:
+    def format_file_section(
+        self, file_path: str | Path | CachedEntry, output: BinaryIO
+    ) -> str:
         """Format a file section including metadata and content.
 
         Args:
-            file_path: Path to the file to process
+            file_path: Path or cached entry of the file to process
             output: Output file to write to
 
+        Returns:
+            str: Detected file type ("Text", "Binary" or "Image")
+
+        Raises:
+            FileProcessingError: If file cannot be processed
+        """
+        section = self.render_file_section(file_path)
+        self.write_file_section(section, output)
+        return section.file_type
+
+    def render_file_section(self, file_path: str | Path | CachedEntry) -> FileSection:
+        """Render a file section including metadata and content.
+
+        Rendering does not touch any shared output, so it is safe to call from
+        multiple threads; the section is encoded here, in the worker, and small
+        text bodies are kept as the bytes read from disk. The header used for
+        type detection is read with ``pread`` and small text bodies continue
+        from the same descriptor. Files whose extension decides their type are
+        not probed, and text bodies larger than ``STREAM_THRESHOLD`` are not
+        read here; they are streamed when the section is written.
+
+        Args:
+            file_path: Path or cached entry of the file to process
+
+        Returns:
+            FileSection: Rendered section
+
         Raises:
             FileProcessingError: If file cannot be processed
         """
-        if not os.path.exists(file_path):
+        entry = CachedEntry.of(file_path)
+        file_path = entry.path
+        if not entry.exists():
             logger.error("File does not exist: %s", file_path)
             raise FileProcessingError(f"File does not exist: {file_path}")
 
         try:
             # Get file info
-            stat = os.stat(file_path)
-            modified = datetime.fromtimestamp(stat.st_mtime).strftime(
-                "%Y-%m-%d %H:%M:%S"
+            stat = entry.stat()
+            modified = (
+                datetime.fromtimestamp(stat.st_mtime)
+                .strftime("%Y-%m-%d %H:%M:%S")
+                .encode("ascii")
             )
-            file_type = "Text"
+            file_type = self.file_type_detector.detect_by_extension(entry)
+            content = None
+            if file_type is None or (
+                file_type == "Text" and stat.st_size <= STREAM_THRESHOLD
+            ):
+                file_type, content = self._read_text_file(
+                    entry, stat.st_size, file_type
+                )
 
-            if self.file_type_detector.is_binary_file(file_path):
-                file_type = "Binary"
-            elif self.file_type_detector.is_image_file(file_path):
-                file_type = "Image"
-
-            # Write header with relative path
+            # Header with relative path and metadata
             rel_path = os.path.relpath(file_path)
-            output.write(f"\n## File: `{rel_path}`\n\n")
-
-            # Write metadata
-            output.write("**Metadata**:\n\n")
-            output.write(f"- **Type**: {file_type}\n")
-            output.write(f"- **Size**: {stat.st_size} bytes\n")
-            output.write(f"- **Last Modified**: {modified}\n\n")
+            parts = [
+                _FILE_HEAD_TEMPLATE
+                % (
+                    rel_path.encode("utf-8"),
+                    _TYPE_BYTES[file_type],
+                    stat.st_size,
+                    modified,
+                )
+            ]
+            section = FileSection(file_type=file_type, head=b"", tail=_SECTION_END)
 
-            # Write content or placeholder
+            # Content or placeholder, followed by the section separator
             if file_type == "Binary":
-                output.write("*Content excluded: Binary file*\n")
+                parts.append(b"*Content excluded: Binary file*\n")
             elif file_type == "Image":
-                output.write("*Content excluded: Image file*\n")
+                parts.append(b"*Content excluded: Image file*\n")
             else:
-                language = self.detect_language(file_path)
-                output.write(f"`````{language}\n")
-                try:
-                    with SafeOpen(file_path, "r", encoding="utf-8") as f:
-                        output.write(f.read())
-                except UnicodeDecodeError as e:
-                    logger.error("Failed to decode file %s: %s", file_path, e)
-                    raise FileProcessingError(f"Failed to decode file: {e}") from e
-                output.write("\n`````")
-
-            # Add section separator
-            output.write("\n\n---\n")
+                language = self.detect_language(entry)
+                parts.append(b"`````%s\n" % language.encode("utf-8"))
+                if stat.st_size > STREAM_THRESHOLD:
+                    section.body_path = file_path
+                elif content is not None:
+                    try:
+                        parts.append(normalize_text(content))
+                    except UnicodeDecodeError as e:
+                        logger.error("Failed to decode file %s: %s", file_path, e)
+                        raise FileProcessingError(f"Failed to decode file: {e}") from e
+                section.tail = _CODE_SECTION_END
+            section.head = b"".join(parts)
+            return section
 
         except (OSError, IOError) as e:
             logger.error("Error processing file %s: %s", file_path, e)
             raise FileProcessingError(f"Failed to process file: {e}") from e
 
-    def format_directory_tree(self, tree_content: str, output: TextIO) -> None:
+    def _read_text_file(
+        self, entry: CachedEntry, size: int, file_type: str | None = None
+    ) -> tuple[str, bytes | None]:
+        """Detect the type of a file and read its content through one descriptor.
+
+        Args:
+            entry: Cached entry of the file to read
+            size: Size of the file in bytes
+            file_type: Type already decided by the extension, or None to detect
+                it from the leading ``PROBE_SIZE`` bytes
+
+        Returns:
+            tuple: Detected file type and the raw content of text files no
+            larger than ``STREAM_THRESHOLD``, or None otherwise
+
+        Raises:
+            OSError: If the file cannot be opened or read
+            FileProcessingError: If type detection fails
+        """
+        fd = os.open(entry.path, READ_FLAGS)
+        try:
+            fadvise(fd, 0, 0, "SEQUENTIAL")
+            header = pread(fd, PROBE_SIZE, 0)
+            if file_type is None:
+                file_type = self.file_type_detector.detect_file_type(entry, header)
+            if file_type != "Text" or size > STREAM_THRESHOLD:
+                return file_type, None
+
+            chunks = [header]
+            offset = len(header)
+            while offset >= PROBE_SIZE:
+                chunk = pread(fd, STREAM_THRESHOLD, offset)
+                if not chunk:
+                    break
+                chunks.append(chunk)
+                offset += len(chunk)
+            return file_type, b"".join(chunks)
+        finally:
+            os.close(fd)
+
+    def write_file_section(self, section: FileSection, output: BinaryIO) -> None:
+        """Write a rendered file section to output.
+
+        Streamed bodies are validated and normalized in chunks while they are
+        copied, from a single read of the file up to its end.
+
+        Args:
+            section: Rendered section to write
+            output: Output file to write to
+
+        Raises:
+            FileProcessingError: If the file body cannot be copied
+        """
+        output.write(section.head)
+        if section.body_path is not None:
+            try:
+                copy_normalized_text(section.body_path, output)
+            except (OSError, UnicodeDecodeError) as e:
+                logger.error("Error copying file %s: %s", section.body_path, e)
+                raise FileProcessingError(f"Failed to copy file: {e}") from e
+        output.write(section.tail)
+
+    def format_directory_tree(self, tree_content: str, output: BinaryIO) -> None:
         """Format the directory tree section.
 
         Args:
             tree_content: Directory tree content to format
             output: Output file to write to
         """
-        output.write("## Directory Structure\n\n")
         if tree_content:
-            output.write("`````plaintext\n")
-            output.write(tree_content.strip())
-            output.write("\n`````")
-        output.write("\n\n---\n")
+            tree_block = f"`````plaintext\n{tree_content.strip()}\n`````"
+        else:
+            tree_block = ""
+        output.write(f"## Directory Structure\n\n{tree_block}\n\n---\n".encode("utf-8"))
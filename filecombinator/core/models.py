@@ -2,10 +2,10 @@
 """Data models for the FileCombinator package."""
 
 from dataclasses import dataclass, field
-from typing import List
+from typing import List, Optional
 
 
-@dataclass
+@dataclass(slots=True)
 class FileStats:
     """Track file processing statistics and counters."""
 
@@ -15,10 +15,26 @@ class FileStats:
     image: int = 0
 
 
-@dataclass
+@dataclass(slots=True)
 class FileLists:
     """Container for processed file lists."""
 
     text: List[str] = field(default_factory=list)
     binary: List[str] = field(default_factory=list)
     image: List[str] = field(default_factory=list)
+
+
+@dataclass(slots=True)
+class FileSection:
+    """Rendered output section for a single file.
+
+    Sections are pre-encoded UTF-8. Large text bodies are not held in memory:
+    ``body_path`` names the file whose content is validated, normalized and
+    streamed into the output between ``head`` and ``tail`` when the section
+    is written.
+    """
+
+    file_type: str
+    head: bytes
+    tail: bytes = b""
+    body_path: Optional[str] = None
@@ -1,18 +1,48 @@
 # filecombinator/processors/content.py
 """File content processing for FileCombinator."""
 
+import contextlib
 import logging
 import os
+import tempfile
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, TextIO
+from typing import BinaryIO, Dict, Optional, cast
 
 from ..core.exceptions import FileProcessingError
-from ..core.file_utils import FileTypeDetector, SafeOpen
+from ..core.file_utils import (
+    CachedEntry,
+    FileTypeDetector,
+    copy_normalized_text,
+    normalize_text,
+)
 from ..core.models import FileLists, FileStats
 
 logger = logging.getLogger(__name__)
 
+# Text bodies up to this size are read whole; larger ones are streamed
+_READ_THRESHOLD = 64 * 1024
+
+# Streamed bodies bound for unseekable outputs are held in memory up to this size
+_SPILL_SIZE = 1024 * 1024
+
+# Pre-encoded names of detected file types
+_TYPE_BYTES = {"Text": b"Text", "Binary": b"Binary", "Image": b"Image"}
+
+# Pre-encoded markers of the plain-text section format
+_SEPARATOR = b"=" * 18
+_FILE_HEADER = b"\n" + _SEPARATOR + b" FILE SEPARATOR " + _SEPARATOR + b"\n"
+_IMAGE_MARKER = _SEPARATOR + b" IMAGE FILE (CONTENT EXCLUDED) " + _SEPARATOR + b"\n"
+_BINARY_MARKER = _SEPARATOR + b" BINARY FILE (CONTENT EXCLUDED) " + _SEPARATOR + b"\n"
+_START_MARKER = _SEPARATOR + b" START OF FILE " + _SEPARATOR + b"\n"
+_END_MARKER = b"\n" + _SEPARATOR + b" END OF FILE " + _SEPARATOR + b"\n"
+
+# File header and metadata, filled with bytes formatting per file
+_FILE_HEADER_TEMPLATE = (
+    _FILE_HEADER
+    + b"FILEPATH: %s\nMetadata: Type: %s, Size: %d bytes, Last Modified: %s\n"
+)
+
 
 class ContentProcessor:
     """Handles file content processing and metadata collection."""
@@ -23,11 +53,11 @@ class ContentProcessor:
         self._stats = FileStats()
         self._files = FileLists()
 
-    def get_file_info(self, file_path: str | Path) -> Dict[str, str]:
+    def get_file_info(self, file_path: str | Path | CachedEntry) -> Dict[str, str]:
         """Get file information including size, modification time, and type.
 
         Args:
-            file_path: Path to file to get info for
+            file_path: Path or cached entry of the file to get info for
 
         Returns:
             Dict containing file metadata
@@ -36,12 +66,9 @@ class ContentProcessor:
             FileProcessingError: If there's an error getting file info
         """
         try:
-            stat = os.stat(file_path)
-            file_type = "Text"
-            if self.file_type_detector.is_binary_file(file_path):
-                file_type = "Binary"
-            elif self.file_type_detector.is_image_file(file_path):
-                file_type = "Image"
+            entry = CachedEntry.of(file_path)
+            stat = entry.stat()
+            file_type = self.file_type_detector.detect_file_type(entry)
 
             return {
                 "size": str(stat.st_size),
@@ -54,113 +81,146 @@ class ContentProcessor:
             logger.error("Error getting file info for %s: %s", file_path, e)
             raise FileProcessingError(f"Failed to get file info: {e}") from e
 
-    def process_file(self, file_path: str | Path, output_file: TextIO) -> None:
+    def process_file(
+        self, file_path: str | Path | CachedEntry, output_file: BinaryIO
+    ) -> None:
         """Process a single file and write its content to output.
 
+        Small text bodies are read as bytes and written without a round trip
+        through ``str``. Larger ones are streamed through
+        ``copy_normalized_text`` in chunks, read from a memory map above
+        256 KiB.
+
         Args:
-            file_path: Path to file to process
-            output_file: File object to write to
+            file_path: Path or cached entry of the file to process
+            output_file: Binary file object to write to
 
         Raises:
             FileProcessingError: If file can't be processed
         """
         try:
-            relative_path = os.path.relpath(file_path)
+            entry = CachedEntry.of(file_path)
+            relative_path = os.path.relpath(entry.path)
             logger.debug("Processing file: %s", relative_path)
 
             try:
-                file_info = self.get_file_info(file_path)
+                file_info = self.get_file_info(entry)
             except FileProcessingError:
-                self._increment_stat("skipped")
+                self._stats.skipped += 1
                 raise
 
-            separator = "=" * 18
-
-            output_file.write(f"\n{separator} FILE SEPARATOR {separator}\n")
-            output_file.write(f"FILEPATH: {relative_path}\n")
+            size = int(file_info["size"])
             output_file.write(
-                f"Metadata: Type: {file_info['type']}, "
-                f"Size: {file_info['size']} bytes, "
-                f"Last Modified: {file_info['modified']}\n"
+                _FILE_HEADER_TEMPLATE
+                % (
+                    relative_path.encode("utf-8"),
+                    _TYPE_BYTES[file_info["type"]],
+                    size,
+                    file_info["modified"].encode("ascii"),
+                )
             )
 
             if file_info["type"] == "Image":
-                output_file.write(
-                    f"{separator} IMAGE FILE (CONTENT EXCLUDED) {separator}\n"
-                )
-                self._increment_stat("image")
-                self._add_file("image", relative_path)
+                output_file.write(_IMAGE_MARKER)
+                self._stats.image += 1
+                self._files.image.append(relative_path)
                 logger.info("Skipping content of image file: %s", relative_path)
             elif file_info["type"] == "Binary":
-                output_file.write(
-                    f"{separator} BINARY FILE (CONTENT EXCLUDED) {separator}\n"
-                )
-                self._increment_stat("binary")
-                self._add_file("binary", relative_path)
+                output_file.write(_BINARY_MARKER)
+                self._stats.binary += 1
+                self._files.binary.append(relative_path)
                 logger.info("Skipping content of binary file: %s", relative_path)
             else:
-                output_file.write(f"{separator} START OF FILE {separator}\n")
+                output_file.write(_START_MARKER)
                 try:
-                    with SafeOpen(file_path, "r", encoding="utf-8") as f:
-                        output_file.write(f.read())
-                    self._increment_stat("processed")
-                    self._add_file("text", relative_path)
+                    self._write_body(entry, size, output_file)
+                    self._stats.processed += 1
+                    self._files.text.append(relative_path)
                 except (UnicodeDecodeError, IOError, OSError) as e:
                     logger.warning("Error reading file %s: %s", relative_path, e)
-                    output_file.write(f"Error reading file: {e}\n")
-                    self._increment_stat("skipped")
+                    output_file.write(f"Error reading file: {e}\n".encode("utf-8"))
+                    self._stats.skipped += 1
                     raise FileProcessingError(f"Failed to read file: {e}") from e
-                output_file.write(f"\n{separator} END OF FILE {separator}\n")
+                output_file.write(_END_MARKER)
         except FileProcessingError:
             raise
         except Exception as e:
             logger.error("Error processing %s: %s", file_path, e)
-            self._increment_stat("skipped")
+            self._stats.skipped += 1
             raise FileProcessingError(f"Failed to process file: {e}") from e
 
-    def track_file(self, file_path: str | Path) -> None:
+    def _write_body(self, entry: CachedEntry, size: int, output: BinaryIO) -> None:
+        """Copy the body of a text file to output, all or nothing.
+
+        Streamed bodies are validated while they are copied, so a body that
+        fails part way is rolled back: seekable outputs are truncated to where
+        the body started, and bodies for other outputs are spilled to a
+        temporary file first and only copied once they are valid.
+
+        Args:
+            entry: Cached entry of the text file
+            size: Size of the file in bytes
+            output: Binary file object to write to
+
+        Raises:
+            OSError: If the file cannot be read or the output written
+            UnicodeDecodeError: If the body is not valid UTF-8
+        """
+        if size <= _READ_THRESHOLD:
+            with open(entry.path, "rb") as f:
+                output.write(normalize_text(f.read()))
+        elif output.seekable():
+            start = output.tell()
+            try:
+                copy_normalized_text(entry.path, output)
+            except (UnicodeDecodeError, OSError):
+                with contextlib.suppress(OSError):
+                    output.seek(start)
+                    output.truncate()
+                raise
+        else:
+            with tempfile.SpooledTemporaryFile(max_size=_SPILL_SIZE) as spooled:
+                spill = cast(BinaryIO, spooled)
+                copy_normalized_text(entry.path, spill)
+                spill.seek(0)
+                while chunk := spill.read(_SPILL_SIZE):
+                    output.write(chunk)
+
+    def track_file(
+        self, file_path: str | Path | CachedEntry, file_type: Optional[str] = None
+    ) -> None:
         """Track a file for statistics without processing its content.
 
         Args:
-            file_path: Path to the file to track
+            file_path: Path or cached entry of the file to track
+            file_type: Already detected file type ("Text", "Binary" or "Image"),
+                which skips type detection when given
         """
         try:
+            entry = CachedEntry.of(file_path)
+
             # Check if file exists
-            if not os.path.exists(file_path):
-                logger.error("File does not exist: %s", file_path)
-                self._increment_stat("skipped")
+            if file_type is None and not entry.exists():
+                logger.error("File does not exist: %s", entry.path)
+                self._stats.skipped += 1
                 return
 
             # Detect file type and track accordingly
-            if self.file_type_detector.is_binary_file(file_path):
-                self._increment_stat("binary")
-                self._add_file("binary", str(file_path))
-            elif self.file_type_detector.is_image_file(file_path):
-                self._increment_stat("image")
-                self._add_file("image", str(file_path))
+            if file_type is None:
+                file_type = self.file_type_detector.detect_file_type(entry)
+
+            if file_type == "Binary":
+                self._stats.binary += 1
+                self._files.binary.append(entry.path)
+            elif file_type == "Image":
+                self._stats.image += 1
+                self._files.image.append(entry.path)
             else:
-                self._increment_stat("processed")
-                self._add_file("text", str(file_path))
+                self._stats.processed += 1
+                self._files.text.append(entry.path)
         except Exception as e:
             logger.error("Error tracking file %s: %s", file_path, e)
-            self._increment_stat("skipped")
-
-    def _increment_stat(self, stat_name: str) -> None:
-        """Increment a statistics counter.
-
-        Args:
-            stat_name: Name of the stat to increment
-        """
-        setattr(self._stats, stat_name, getattr(self._stats, stat_name) + 1)
-
-    def _add_file(self, file_type: str, filename: str) -> None:
-        """Add a file to the appropriate tracking list.
-
-        Args:
-            file_type: Type of file (text, binary, image)
-            filename: Name of the file
-        """
-        getattr(self._files, file_type).append(filename)
+            self._stats.skipped += 1
 
     @property
     def stats(self) -> FileStats:
@@ -1,21 +1,66 @@
 # filecombinator/processors/directory.py
 """Directory tree generation and processing for FileCombinator."""
 
+import contextlib
+import fnmatch
+import functools
 import logging
 import os
+import re
 from pathlib import Path
-from typing import Protocol
+from typing import AbstractSet, Callable, Iterator, Protocol
 
 from ..core.exceptions import DirectoryProcessingError
+from ..core.file_utils import CachedEntry
 
 logger = logging.getLogger(__name__)
 
+# Suffix of output files written by earlier versions
+_OUTPUT_SUFFIX = "_file_combinator_output.txt"
+
+# Whether scanned entries carry reliable inode numbers without a stat call
+_COMPARE_INODES = os.name != "nt"
+
+# Wildcards that make an exclude pattern a glob rather than a literal name
+_WILDCARDS = re.compile(r"[*?]")
+
+# Number of glob exclusion decisions memoized per processor
+_EXCLUDE_CACHE_SIZE = 8192
+
+
+def _is_glob(pattern: str) -> bool:
+    """Check if an exclude pattern has any wildcard for fnmatch.
+
+    A ``[`` only starts a character class when a closing ``]`` follows it;
+    as in ``fnmatch``, a ``]`` right after ``[`` or ``[!`` belongs to the class
+    and does not close it. Any other ``[`` is a literal character.
+
+    Args:
+        pattern: Exclude pattern to check
+
+    Returns:
+        bool: True if the pattern contains ``*``, ``?`` or a character class
+    """
+    if _WILDCARDS.search(pattern):
+        return True
+    start = pattern.find("[")
+    while start != -1:
+        end = start + 1
+        if pattern.startswith("!", end):
+            end += 1
+        if pattern.startswith("]", end):
+            end += 1
+        if pattern.find("]", end) != -1:
+            return True
+        start = pattern.find("[", start + 1)
+    return False
+
 
 class FileCallback(Protocol):
     """Protocol for file callback functions."""
 
-    def __call__(self, file_path: str) -> None:
-        """Call the callback function with the file path."""
+    def __call__(self, entry: CachedEntry, /) -> None:
+        """Call the callback function with the cached entry of a file."""
         ...
 
 
@@ -23,16 +68,97 @@ class DirectoryProcessor:
     """Handles directory traversal and tree generation."""
 
     def __init__(
-        self, exclude_patterns: set[str], output_file: str | None = None
+        self,
+        exclude_patterns: AbstractSet[str],
+        output_file: str | None = None,
+        sort_by_inode: bool = False,
+        output_suffix: str | None = None,
     ) -> None:
         """Initialize DirectoryProcessor.
 
         Args:
             exclude_patterns: Set of patterns to exclude from processing
             output_file: Optional path to output file to exclude from processing
+            sort_by_inode: Stat the files of each directory in inode order.
+                Ignored on Windows, where inode numbers carry no locality.
+            output_suffix: Optional configured suffix of output files, which
+                are excluded from processing along with temporary outputs
         """
         self.exclude_patterns = exclude_patterns
         self.output_file = output_file
+        self.sort_by_inode = sort_by_inode and os.name != "nt"
+        self._output_suffixes: tuple[str, ...] = (_OUTPUT_SUFFIX,)
+        if output_suffix:
+            self._output_suffixes += (output_suffix,)
+        self._min_suffix_len = min(map(len, self._output_suffixes))
+
+    @property
+    def output_file(self) -> str | None:
+        """Get the path of the output file excluded from processing."""
+        return self._output_file
+
+    @output_file.setter
+    def output_file(self, output_file: str | None) -> None:
+        """Set the output file, resolving its absolute path and identity once.
+
+        Args:
+            output_file: Path to the output file, or None
+        """
+        self._output_file = output_file
+        self._abs_output_file = os.path.abspath(output_file) if output_file else None
+        self._output_name = (
+            os.path.basename(self._abs_output_file) if self._abs_output_file else None
+        )
+        self._refresh_output_key()
+
+    def _refresh_output_key(self) -> None:
+        """Read the device and inode of the output file, if it exists.
+
+        Scanned entries are matched against this key instead of their absolute
+        paths. It is read again at the start of every walk, since the output
+        may be created or replaced (e.g. by ``os.replace``) after it was set.
+        """
+        self._output_key: tuple[int, int] | None = None
+        if self._abs_output_file and _COMPARE_INODES:
+            with contextlib.suppress(OSError):
+                stat = os.lstat(self._abs_output_file)
+                self._output_key = (stat.st_dev, stat.st_ino)
+
+    @property
+    def exclude_patterns(self) -> AbstractSet[str]:
+        """Get the patterns excluded from processing.
+
+        The patterns are returned as a frozenset, since they are compiled when
+        assigned; assign a new set to change them.
+        """
+        return self._exclude_patterns
+
+    @exclude_patterns.setter
+    def exclude_patterns(self, patterns: AbstractSet[str]) -> None:
+        """Set the excluded patterns and precompile their matchers.
+
+        Literal names go into a frozenset for constant-time membership tests;
+        glob patterns are compiled into a single regex whose decisions are
+        memoized per name, since the same names (``src``, ``__init__.py``,
+        ...) recur in every level of a tree. Both are rebuilt whenever the
+        patterns are assigned.
+
+        Args:
+            patterns: Names or glob patterns to exclude
+        """
+        self._exclude_patterns = frozenset(patterns)
+        self._exclude_names = frozenset(
+            pattern for pattern in self._exclude_patterns if not _is_glob(pattern)
+        )
+        self._matches_glob: Callable[[str], bool] = lambda name: False
+        globs = sorted(self._exclude_patterns - self._exclude_names)
+        if globs:
+            match = re.compile(
+                "|".join(fnmatch.translate(pattern) for pattern in globs)
+            ).match
+            self._matches_glob = functools.lru_cache(maxsize=_EXCLUDE_CACHE_SIZE)(
+                lambda name: match(name) is not None
+            )
 
     def is_excluded(self, path: Path) -> bool:
         """Check if a path should be excluded.
@@ -43,27 +169,90 @@ class DirectoryProcessor:
         Returns:
             bool: True if path should be excluded, False otherwise
         """
-        path_abs = os.path.abspath(path)
-        output_abs = os.path.abspath(self.output_file) if self.output_file else None
-
-        if output_abs and path_abs == output_abs:
-            logger.debug("Skipping output file: %s", path)
+        if self._is_output_file(str(path), path.name):
             return True
 
-        file_name = os.path.basename(path)
-        if file_name.endswith("_file_combinator_output.txt"):
-            logger.debug("Skipping file combinator output file: %s", path)
+        parts = path.parts
+        excluded = not self._exclude_names.isdisjoint(parts) or any(
+            self._matches_glob(part) for part in parts
+        )
+        if excluded:
+            logger.debug("Excluded path: %s", path)
+
+        return excluded
+
+    def _is_excluded_entry(self, entry: os.DirEntry[str]) -> bool:
+        """Check if a directory entry should be excluded.
+
+        Only the entry name is matched against the exclude patterns, since
+        excluded ancestors are pruned before their contents are scanned.
+
+        Args:
+            entry: Directory entry to check
+
+        Returns:
+            bool: True if the entry should be excluded, False otherwise
+        """
+        if self._is_output_file(entry.path, entry.name, entry):
             return True
 
-        excluded = any(exclude in path.parts for exclude in self.exclude_patterns)
+        name = entry.name
+        excluded = name in self._exclude_names or self._matches_glob(name)
         if excluded:
-            logger.debug("Excluded path: %s", path)
+            logger.debug("Excluded path: %s", entry.path)
 
         return excluded
 
+    def _is_output_file(
+        self, path: str, file_name: str, entry: os.DirEntry[str] | None = None
+    ) -> bool:
+        """Check if a path is the output file or a previous combinator output.
+
+        Scanned entries are compared by inode, which ``os.scandir`` reports
+        without a stat call, and only stat'ed for the device on a match. Other
+        paths, all paths on Windows, and scanned entries while the output file
+        did not exist at the start of the walk are compared by absolute path.
+
+        Args:
+            path: Path to check
+            file_name: Base name of the path
+            entry: Directory entry of the path, if it was scanned
+
+        Returns:
+            bool: True if the path is an output file, False otherwise
+        """
+        if self._abs_output_file is not None:
+            key = self._output_key
+            if entry is not None and key is not None:
+                is_output = (
+                    entry.inode() == key[1]
+                    and entry.stat(follow_symlinks=False).st_dev == key[0]
+                )
+            elif entry is not None:
+                is_output = (
+                    file_name == self._output_name
+                    and os.path.abspath(path) == self._abs_output_file
+                )
+            else:
+                is_output = os.path.abspath(path) == self._abs_output_file
+            if is_output:
+                logger.debug("Skipping output file: %s", path)
+                return True
+
+        if len(file_name) >= self._min_suffix_len and file_name.endswith(
+            self._output_suffixes
+        ):
+            logger.debug("Skipping file combinator output file: %s", path)
+            return True
+
+        return False
+
     def generate_tree(self, start_path: str | Path) -> str:
         """Generate a string representation of the directory tree.
 
+        This walks the whole tree; callers that also need the files should
+        call ``scan`` instead, which collects both in the same walk.
+
         Args:
             start_path: Root path to start tree generation from
 
@@ -77,37 +266,39 @@ class DirectoryProcessor:
             raise DirectoryProcessingError(f"Directory does not exist: {start_path}")
 
         try:
-            entries = [
-                e for e in os.scandir(start_path) if not self.is_excluded(Path(e.path))
-            ]
-
-            if not entries:
-                return ""  # Return empty string for empty directories
+            return self._walk(os.fspath(start_path))[0]
+        except Exception as e:
+            logger.error("Error generating directory tree: %s", e)
+            raise DirectoryProcessingError(
+                f"Failed to generate directory tree: {e}"
+            ) from e
 
-            lines = []
-            root_name = os.path.basename(start_path) or str(start_path)
-            lines.append(root_name + "/")
+    def scan(self, directory: str | Path) -> tuple[str, list[CachedEntry]]:
+        """Walk a directory once, collecting both its tree and its files.
 
-            def add_to_tree(dir_path: Path, prefix: str = "") -> None:
-                entries = sorted(os.scandir(dir_path), key=lambda e: e.name)
-                entries = [e for e in entries if not self.is_excluded(Path(e.path))]
+        The walk is eager: the tree has to be complete before any file content
+        is written, so there is nothing to gain from yielding files early here.
+        Callers that only need the files can use the lazy ``iter_files``.
 
-                for i, entry in enumerate(entries):
-                    is_last = i == len(entries) - 1
-                    connector = "└── " if is_last else "├── "
-                    lines.append(f"{prefix}{connector}{entry.name}")
+        Args:
+            directory: Directory to scan
 
-                    if entry.is_dir():
-                        next_prefix = prefix + ("    " if is_last else "│   ")
-                        add_to_tree(Path(entry.path), next_prefix)
+        Returns:
+            tuple: String representation of the directory tree, and the entries
+            of all non-excluded files in processing order
 
-            add_to_tree(Path(start_path))
-            return "\n".join(lines)
+        Raises:
+            DirectoryProcessingError: If the directory can't be scanned
+        """
+        if not os.path.exists(directory):
+            raise DirectoryProcessingError(f"Directory does not exist: {directory}")
 
-        except Exception as e:
-            logger.error("Error generating directory tree: %s", e)
+        try:
+            return self._walk(os.fspath(directory))
+        except OSError as e:
+            logger.error("Error scanning directory %s: %s", directory, e)
             raise DirectoryProcessingError(
-                f"Failed to generate directory tree: {e}"
+                f"Failed to process directory {directory}: {e}"
             ) from e
 
     def process_directory(
@@ -117,31 +308,131 @@ class DirectoryProcessor:
     ) -> None:
         """Process all files in a directory recursively.
 
+        Files are passed to the callback as ``iter_files`` reaches them, so
+        processing starts before the rest of the tree has been scanned.
+
         Args:
             directory: Directory to process
-            callback: Function to call for each file
+            callback: Function to call with the cached entry of each file
 
         Raises:
             DirectoryProcessingError: If directory can't be processed
         """
-        if not os.path.exists(directory):
-            raise DirectoryProcessingError(f"Directory does not exist: {directory}")
-
         try:
-            for root, dirs, files in os.walk(directory):
-                # Filter out excluded directories
-                dirs[:] = [
-                    d for d in dirs if not self.is_excluded(Path(os.path.join(root, d)))
-                ]
-
-                # Process files
-                for file in sorted(files):
-                    file_path = os.path.join(root, file)
-                    if not self.is_excluded(Path(file_path)):
-                        callback(file_path)
+            for entry in self.iter_files(directory):
+                callback(entry)
 
         except OSError as e:
             logger.error("Error processing directory %s: %s", directory, e)
             raise DirectoryProcessingError(
                 f"Failed to process directory {directory}: {e}"
             ) from e
+
+    def iter_files(self, directory: str | Path) -> Iterator[CachedEntry]:
+        """Iterate lazily over all non-excluded files in a directory recursively.
+
+        Directories are scanned one at a time as the iteration reaches them,
+        and no tree is rendered, so the first files are yielded without
+        walking the rest of the tree. Files come in the same order as those
+        returned by ``scan``.
+
+        Args:
+            directory: Directory to iterate over
+
+        Yields:
+            CachedEntry: Entry for each file, in processing order
+
+        Raises:
+            DirectoryProcessingError: If directory can't be scanned
+        """
+        if not os.path.exists(directory):
+            raise DirectoryProcessingError(f"Directory does not exist: {directory}")
+
+        self._refresh_output_key()
+        stack = [os.fspath(directory)]
+        while stack:
+            files: list[CachedEntry] = []
+            try:
+                entries = self._scan_dir(stack.pop(), files)
+            except OSError as e:
+                logger.error("Error scanning directory %s: %s", directory, e)
+                raise DirectoryProcessingError(
+                    f"Failed to process directory {directory}: {e}"
+                ) from e
+            stack.extend(
+                e.path for e in reversed(entries) if e.is_dir(follow_symlinks=False)
+            )
+            yield from files
+
+    def _walk(self, top: str) -> tuple[str, list[CachedEntry]]:
+        """Render the tree of a directory and collect its files in a single pass.
+
+        The walk is iterative, with an explicit stack. Tree lines follow name
+        order with files and directories interleaved, while files are
+        collected per directory as it is scanned: all files of a directory in
+        name order, followed by those of its subdirectories, depth-first in
+        name order. Excluded entries are pruned before they are scanned.
+        Symlinks to directories are listed in the tree but neither followed
+        nor processed.
+
+        Args:
+            top: Directory to walk
+
+        Returns:
+            tuple: Tree string (empty if nothing is left after exclusion) and
+            the file entries in processing order
+        """
+        self._refresh_output_key()
+        lines: list[str] = []
+        files: list[CachedEntry] = []
+        stack = [(self._scan_dir(top, files), 0, "")]
+        while stack:
+            entries, index, prefix = stack.pop()
+            if index >= len(entries):
+                continue
+            stack.append((entries, index + 1, prefix))
+
+            entry = entries[index]
+            is_last = index == len(entries) - 1
+            connector = "└── " if is_last else "├── "
+            lines.append(f"{prefix}{connector}{entry.name}")
+
+            if entry.is_dir(follow_symlinks=False):
+                next_prefix = prefix + ("    " if is_last else "│   ")
+                stack.append((self._scan_dir(entry.path, files), 0, next_prefix))
+
+        if not lines:
+            return "", files  # Empty string for empty directories
+
+        root_name = os.path.basename(top) or top
+        return root_name + "/\n" + "\n".join(lines), files
+
+    def _scan_dir(self, path: str, files: list[CachedEntry]) -> list[os.DirEntry[str]]:
+        """Scan one directory, collecting the entries of its files.
+
+        With ``sort_by_inode`` enabled, the files are stat'ed in inode order
+        first. Files with adjacent inodes tend to be physically close, so this
+        reduces seeking on rotating disks; the cached results are reused by
+        every later consumer of the entries.
+
+        Args:
+            path: Directory to scan
+            files: List the directory's files are appended to, in name order
+
+        Returns:
+            list: Non-excluded entries of the directory, in name order
+        """
+        with os.scandir(path) as it:
+            entries = sorted(
+                (e for e in it if not self._is_excluded_entry(e)),
+                key=lambda e: e.name,
+            )
+
+        dir_files = [e for e in entries if not e.is_dir()]
+        if self.sort_by_inode:
+            for entry in sorted(dir_files, key=lambda e: e.inode()):
+                with contextlib.suppress(OSError):
+                    entry.stat()
+
+        files.extend(CachedEntry.from_dir_entry(e) for e in dir_files)
+        return entries
@@ -0,0 +1,55 @@
+# tests/conftest.py
+"""Shared pytest configuration for the FileCombinator test suite."""
+
+import os
+import shutil
+import sys
+import tempfile
+
+import pytest
+
+from filecombinator.core.config import get_config
+
+# Memory-backed filesystem used for test temporary directories on Linux
+SHM_DIR = "/dev/shm"
+
+# Base temporary directory created on tmpfs by this session, if any
+_SHM_BASETEMP = pytest.StashKey[str]()
+
+
+def pytest_configure(config: pytest.Config) -> None:
+    """Place pytest's base temporary directory on tmpfs when available.
+
+    Fixture files are then created in RAM rather than in a shared temporary
+    directory that may be disk- or network-backed. Each session gets its own
+    directory, so concurrent runs never clean up each other's files; xdist
+    workers inherit it as their parent directory. An explicit ``--basetemp``
+    is left untouched.
+
+    Args:
+        config: The pytest configuration object
+    """
+    if config.option.basetemp is not None:
+        return
+    if not sys.platform.startswith("linux") or not os.access(SHM_DIR, os.W_OK):
+        return
+    basetemp = tempfile.mkdtemp(prefix="fc-tests-", dir=SHM_DIR)
+    config.option.basetemp = basetemp
+    config.stash[_SHM_BASETEMP] = basetemp
+
+
+def pytest_unconfigure(config: pytest.Config) -> None:
+    """Remove the tmpfs base temporary directory created for this session.
+
+    Args:
+        config: The pytest configuration object
+    """
+    basetemp = config.stash.get(_SHM_BASETEMP, None)
+    if basetemp is not None:
+        shutil.rmtree(basetemp, ignore_errors=True)
+
+
+@pytest.fixture(scope="session")
+def config_suffix() -> str:
+    """Get the configured output file suffix, loaded once per session."""
+    return get_config().output_suffix
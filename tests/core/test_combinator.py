@@ -2,44 +2,37 @@
 """Test suite for the core FileCombinator class."""
 
 import os
-import tempfile
-from typing import Generator
+from pathlib import Path
 
 import pytest
 
 from filecombinator.core.combinator import FileCombinator
 from filecombinator.core.exceptions import FileCombinatorError
+from tests.helpers import assert_contains
 
 
 @pytest.fixture
-def test_directory() -> Generator[str, None, None]:
+def test_directory(tmp_path: Path) -> str:
     """Create a test directory with various file types.
 
     Returns:
         Path to test directory
     """
-    with tempfile.TemporaryDirectory() as tmpdir:
-        # Create regular files
-        with open(os.path.join(tmpdir, "text1.txt"), "w", encoding="utf-8") as f:
-            f.write("Text file 1")
-        with open(os.path.join(tmpdir, "text2.txt"), "w", encoding="utf-8") as f:
-            f.write("Text file 2")
-
-        # Create binary and image files
-        with open(os.path.join(tmpdir, "binary.bin"), "wb") as f:
-            f.write(b"\x00\x01\x02\x03")
-        with open(os.path.join(tmpdir, "image.jpg"), "wb") as f:
-            f.write(b"JFIF")
-
-        # Create excluded directories and files
-        os.makedirs(os.path.join(tmpdir, "__pycache__"))
-        os.makedirs(os.path.join(tmpdir, "subdir"))
-        with open(os.path.join(tmpdir, "__pycache__", "cache.pyc"), "w") as f:
-            f.write("cache")
-        with open(os.path.join(tmpdir, "subdir", "text3.txt"), "w") as f:
-            f.write("Text file 3")
-
-        yield tmpdir
+    # Create regular files
+    (tmp_path / "text1.txt").write_text("Text file 1", encoding="utf-8")
+    (tmp_path / "text2.txt").write_text("Text file 2", encoding="utf-8")
+
+    # Create binary and image files
+    (tmp_path / "binary.bin").write_bytes(b"\x00\x01\x02\x03")
+    (tmp_path / "image.jpg").write_bytes(b"JFIF")
+
+    # Create excluded directories and files
+    (tmp_path / "__pycache__").mkdir()
+    (tmp_path / "subdir").mkdir()
+    (tmp_path / "__pycache__" / "cache.pyc").write_text("cache")
+    (tmp_path / "subdir" / "text3.txt").write_text("Text file 3")
+
+    return str(tmp_path)
 
 
 @pytest.fixture
@@ -72,11 +65,8 @@ def test_process_directory(combinator: FileCombinator, test_directory: str) -> N
     output_file = os.path.join(test_directory, "output.txt")
     combinator.process_directory(test_directory, output_file)
 
-    assert os.path.exists(output_file)
-    with open(output_file, "r", encoding="utf-8") as f:
-        content = f.read()
-        assert "## Directory Structure" in content
-        assert "```" in content  # Tree should be in code block
+    # Tree should be in a code block
+    assert_contains(output_file, must=["## Directory Structure", "```"])
 
 
 def test_process_nonexistent_directory(combinator: FileCombinator) -> None:
@@ -92,8 +82,7 @@ def test_process_directory_with_existing_output(
     output_file = os.path.join(test_directory, "output.txt")
 
     # Create existing output file with some content
-    with open(output_file, "w", encoding="utf-8") as f:
-        f.write("Existing content")
+    Path(output_file).write_text("Existing content", encoding="utf-8")
 
     # Configure combinator with output file for proper exclusion
     combinator.output_file = output_file
@@ -102,14 +91,12 @@ def test_process_directory_with_existing_output(
     combinator.process_directory(test_directory, output_file)
 
     # Verify new content
-    with open(output_file, "r", encoding="utf-8") as f:
-        content = f.read()
-        assert "Existing content" not in content
-        assert "output.txt" not in content  # Should not be in directory tree
-        assert (
-            "## Directory Structure" in content
-        )  # Shows structure with proper heading
-        assert "```" in content  # Tree should be in code block
+    # Structure with proper heading in a code block, without the output itself
+    assert_contains(
+        output_file,
+        must=["## Directory Structure", "```"],
+        must_not=["Existing content", "output.txt"],
+    )
 
 
 def test_statistics_tracking(combinator: FileCombinator, test_directory: str) -> None:
@@ -136,3 +123,136 @@ def test_file_list_tracking(combinator: FileCombinator, test_directory: str) ->
     assert any("text1.txt" in f for f in file_lists.text)
     assert any("binary.bin" in f for f in file_lists.binary)
     assert any("image.jpg" in f for f in file_lists.image)
+
+
+@pytest.mark.parametrize("max_workers", [1, 8])
+def test_process_directory_preserves_order(
+    combinator: FileCombinator, tmp_path: Path, max_workers: int
+) -> None:
+    """Test that parallel rendering keeps file sections in traversal order."""
+    combinator.max_workers = max_workers
+    input_dir = tmp_path / "input"
+    input_dir.mkdir()
+    names = [f"file{i:03d}.txt" for i in range(150)]
+    for name in reversed(names):
+        (input_dir / name).write_text(f"Content of {name}")
+
+    output_file = tmp_path / "output.txt"
+    combinator.process_directory(str(input_dir), str(output_file))
+
+    content = output_file.read_text(encoding="utf-8")
+    positions = [content.index(f"Content of {name}") for name in names]
+    assert positions == sorted(positions)
+    assert [os.path.basename(f) for f in combinator.file_lists.text] == names
+
+
+def test_process_directory_streams_large_files(
+    combinator: FileCombinator, tmp_path: Path
+) -> None:
+    """Test that large text bodies are copied intact between sections."""
+    input_dir = tmp_path / "input"
+    input_dir.mkdir()
+    large_content = "".join(f"line {i}\n" for i in range(20000))
+    (input_dir / "a_large.txt").write_text(large_content)
+    (input_dir / "b_small.txt").write_text("Small content")
+
+    output_file = tmp_path / "output.txt"
+    combinator.process_directory(str(input_dir), str(output_file))
+
+    content = output_file.read_text(encoding="utf-8")
+    assert f"`````text\n{large_content}\n`````" in content
+    assert content.index(large_content) < content.index("Small content")
+    assert combinator.stats.processed == 2
+
+
+def test_process_directory_normalizes_large_files(
+    combinator: FileCombinator, tmp_path: Path
+) -> None:
+    """Test that large CRLF bodies get the newline translation of small ones."""
+    input_dir = tmp_path / "input"
+    input_dir.mkdir()
+    lines = [f"print({i})" for i in range(20000)]
+    (input_dir / "large.py").write_bytes("\r\n".join(lines).encode("utf-8"))
+
+    output_file = tmp_path / "output.txt"
+    combinator.process_directory(str(input_dir), str(output_file))
+
+    content = output_file.read_bytes()
+    assert b"\r" not in content
+    assert "`````python\n{}\n`````".format("\n".join(lines)).encode() in content
+
+
+def test_process_directory_rejects_large_invalid_utf8(
+    combinator: FileCombinator, tmp_path: Path
+) -> None:
+    """Test that large bodies are validated as UTF-8 like small ones."""
+    input_dir = tmp_path / "input"
+    input_dir.mkdir()
+    (input_dir / "large.txt").write_bytes(b"a" * 100000 + "caf\u00e9".encode("latin-1"))
+
+    output_file = tmp_path / "output.txt"
+    with pytest.raises(FileCombinatorError, match="decode"):
+        combinator.process_directory(str(input_dir), str(output_file))
+    assert not output_file.exists()
+
+
+@pytest.mark.parametrize("durable", [False, True])
+def test_process_directory_durable(
+    test_directory: str, tmp_path: Path, monkeypatch: pytest.MonkeyPatch, durable: bool
+) -> None:
+    """Test that the output is only fsynced when durability is requested."""
+    synced: list[int] = []
+    monkeypatch.setattr("filecombinator.core.combinator.os.fsync", synced.append)
+
+    combinator = FileCombinator(durable=durable)
+    combinator.process_directory(test_directory, str(tmp_path / "output.txt"))
+
+    assert len(synced) == (1 if durable else 0)
+
+
+def test_temp_file_created_next_to_output(
+    combinator: FileCombinator, test_directory: str
+) -> None:
+    """Test that the temporary output is excluded and renamed into place."""
+    output_file = os.path.join(test_directory, "output.txt")
+    before = set(os.listdir(test_directory))
+
+    combinator.process_directory(test_directory, output_file)
+
+    content = Path(output_file).read_text(encoding="utf-8")
+    assert combinator.output_suffix not in content
+    assert set(os.listdir(test_directory)) == before | {"output.txt"}
+
+
+def test_temp_file_removed_after_error(
+    combinator: FileCombinator, tmp_path: Path
+) -> None:
+    """Test that a failed run does not leave its temporary file behind."""
+    output_dir = tmp_path / "out"
+
+    with pytest.raises(FileCombinatorError):
+        combinator.process_directory(
+            str(tmp_path / "nonexistent"), str(output_dir / "output.txt")
+        )
+
+    assert os.listdir(output_dir) == []
+
+
+def test_print_excluded_files(
+    combinator: FileCombinator,
+    test_directory: str,
+    tmp_path: Path,
+    capsys: pytest.CaptureFixture[str],
+) -> None:
+    """Test the listing of binary and image files excluded from the output."""
+    combinator.process_directory(test_directory, str(tmp_path / "output.txt"))
+    capsys.readouterr()
+
+    combinator._print_excluded_files()
+
+    binary_file = os.path.join(test_directory, "binary.bin")
+    image_file = os.path.join(test_directory, "image.jpg")
+    assert capsys.readouterr().out == (
+        f"\nBinary files detected and excluded:\n  {binary_file}\n"
+        f"\nImage files detected and excluded:\n  {image_file}\n"
+    )
@@ -68,3 +68,31 @@ def test_invalid_config_file(tmp_path: Path) -> None:
 
     with pytest.raises(ValueError):
         load_config_file(str(test_config))
+
+
+def test_load_traversal_config(tmp_path: Path) -> None:
+    """Test loading traversal options from a config file."""
+    test_config = tmp_path / "config.yaml"
+    test_config.write_text("traversal:\n  sort_by_inode: false\n")
+
+    assert load_config_file().sort_by_inode is True
+    assert load_config_file(str(test_config)).sort_by_inode is False
+
+
+@pytest.mark.parametrize("value", ["-1", "two", "true"])
+def test_load_invalid_max_workers(tmp_path: Path, value: str) -> None:
+    """Test that invalid worker counts are rejected."""
+    test_config = tmp_path / "config.yaml"
+    test_config.write_text(f"processing:\n  max_workers: {value}\n")
+
+    with pytest.raises(ValueError, match="max_workers"):
+        load_config_file(str(test_config))
+
+
+def test_load_processing_config(tmp_path: Path) -> None:
+    """Test loading the worker count from a config file."""
+    test_config = tmp_path / "config.yaml"
+    test_config.write_text("processing:\n  max_workers: 3\n")
+
+    assert load_config_file().max_workers == 0
+    assert load_config_file(str(test_config)).max_workers == 3
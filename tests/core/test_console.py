@@ -146,3 +146,15 @@ def test_create_file_table_with_max_files() -> None:
     assert "file2.py" in output
     assert "2 more files" in output
     assert "file4.png" not in output
+
+
+def test_create_file_table_with_total() -> None:
+    """Test file table creation from pre-sliced rows and a total count."""
+    table = create_file_table(["file1.txt", "file2.py"], "Text Files", total=100000)
+    test_console = Console(color_system=None)
+    with test_console.capture() as capture:
+        test_console.print(table)
+    output = capture.get()
+
+    assert "file2.py" in output
+    assert "99998 more files" in output
@@ -1,103 +1,178 @@
 # tests/core/test_file_utils.py
 """Test suite for FileCombinator file utilities."""
 
+import io
+import mmap
 import os
-import tempfile
-from typing import Generator
+from pathlib import Path
+from unittest.mock import patch
 
 import magic
 import pytest
 
 from filecombinator.core.exceptions import FileProcessingError
-from filecombinator.core.file_utils import FileTypeDetector, SafeOpen
+from filecombinator.core.file_utils import (
+    PROBE_SIZE,
+    CachedEntry,
+    FileTypeDetector,
+    copy_normalized_text,
+    file_extension,
+    normalize_text,
+)
+
+# Static sample files by key: file name and content, written as bytes
+SAMPLE_FILES = {
+    "text": ("test.txt", b"Test content"),
+    "binary": ("test.bin", b"\x00\x01\x02\x03"),
+    "image": ("test.jpg", b"JFIF"),  # Simple JPEG header simulation
+    "xml": ("test.xml", b'<?xml version="1.0"?><root></root>'),
+    "json": ("test.json", b'{"key": "value"}'),
+}
+
+
+def write_sample_files(directory: Path) -> dict[str, str]:
+    """Write SAMPLE_FILES into a directory.
+
+    Args:
+        directory: Directory to write the files to
+
+    Returns:
+        Dictionary with paths to the files by key
+    """
+    files = {}
+    for key, (name, payload) in SAMPLE_FILES.items():
+        path = directory / name
+        path.write_bytes(payload)
+        files[key] = str(path)
+    return files
 
 
 @pytest.fixture
-def temp_files() -> Generator[dict[str, str], None, None]:
+def temp_files(tmp_path: Path) -> dict[str, str]:
     """Create temporary test files.
 
     Returns:
         Dictionary with paths to test files
     """
-    with tempfile.TemporaryDirectory() as tmpdir:
-        # Create a text file
-        text_file = os.path.join(tmpdir, "test.txt")
-        with open(text_file, "w", encoding="utf-8") as f:
-            f.write("Test content")
-
-        # Create a binary file
-        binary_file = os.path.join(tmpdir, "test.bin")
-        with open(binary_file, "wb") as f:
-            f.write(b"\x00\x01\x02\x03")
-
-        # Create an image file
-        image_file = os.path.join(tmpdir, "test.jpg")
-        with open(image_file, "wb") as f:
-            f.write(b"JFIF")  # Simple JPEG header simulation
-
-        # Create XML file
-        xml_file = os.path.join(tmpdir, "test.xml")
-        with open(xml_file, "w", encoding="utf-8") as f:
-            f.write('<?xml version="1.0"?><root></root>')
-
-        # Create JSON file
-        json_file = os.path.join(tmpdir, "test.json")
-        with open(json_file, "w", encoding="utf-8") as f:
-            f.write('{"key": "value"}')
-
-        yield {
-            "text": text_file,
-            "binary": binary_file,
-            "image": image_file,
-            "xml": xml_file,
-            "json": json_file,
-            "dir": tmpdir,
-        }
-
-
-def test_safe_open_text(temp_files: dict[str, str]) -> None:
-    """Test SafeOpen with text files."""
-    with SafeOpen(temp_files["text"], "r") as f:
-        content = f.read()
-        assert content == "Test content"
-
-
-def test_safe_open_binary(temp_files: dict[str, str]) -> None:
-    """Test SafeOpen with binary files."""
-    with SafeOpen(temp_files["binary"], "rb") as f:
-        content = f.read()
-        assert content == b"\x00\x01\x02\x03"
-
-
-def test_safe_open_nonexistent() -> None:
-    """Test SafeOpen with nonexistent file."""
-    with pytest.raises(IOError):
-        with SafeOpen("nonexistent.txt", "r"):
-            pass
-
-
-def test_safe_open_with_custom_encoding(temp_files: dict[str, str]) -> None:
-    """Test SafeOpen with custom encoding."""
-    with SafeOpen(temp_files["text"], "r", encoding="ascii") as f:
-        content = f.read()
-        assert content == "Test content"
-
-
-def test_safe_open_context_manager_exception_handling(
-    temp_files: dict[str, str]
+    return {"dir": str(tmp_path), **write_sample_files(tmp_path)}
+
+
+def test_cached_entry_stats_once(
+    temp_files: dict[str, str], monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test that CachedEntry memoizes its stat result."""
+    calls = []
+    real_stat = os.stat
+
+    def counting_stat(path: str) -> os.stat_result:
+        calls.append(path)
+        return real_stat(path)
+
+    monkeypatch.setattr("filecombinator.core.file_utils.os.stat", counting_stat)
+
+    entry = CachedEntry(temp_files["text"])
+    assert entry.name == "test.txt"
+    assert os.fspath(entry) == temp_files["text"]
+    assert entry.exists()
+    assert entry.stat().st_size == len("Test content")
+    assert entry.stat() is entry.stat()
+    assert CachedEntry.of(entry) is entry
+    assert calls == [temp_files["text"]]
+
+
+def test_cached_entry_missing_file() -> None:
+    """Test CachedEntry with a nonexistent file."""
+    entry = CachedEntry("nonexistent.txt")
+    assert not entry.exists()
+    with pytest.raises(OSError):
+        entry.stat()
+
+
+@pytest.mark.skipif(not hasattr(os, "posix_fadvise"), reason="needs posix_fadvise")
+def test_read_file_chunk_hints_sequential(tmp_path: Path) -> None:
+    """Test that the content probe hints sequential access before reading."""
+    source = tmp_path / "probe.dat"
+    source.write_bytes(b"y" * (PROBE_SIZE * 2))
+
+    with patch("os.posix_fadvise") as mock_fadvise:
+        chunk = FileTypeDetector()._read_file_chunk(str(source))
+
+    assert chunk == b"y" * PROBE_SIZE
+    advices = [call.args[1:] for call in mock_fadvise.call_args_list]
+    assert advices == [(0, PROBE_SIZE, os.POSIX_FADV_SEQUENTIAL)]
+
+
+@pytest.mark.parametrize(
+    "content",
+    [
+        b"plain\n" * 10,
+        "caf\u00e9\n".encode("utf-8") * 10,
+        b"crlf\r\n" * 10,
+        b"cr\r" * 10,
+        "a\u00e9\r\n\u20ac\r".encode("utf-8") * 10,
+    ],
+)
+def test_copy_normalized_text(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, content: bytes
+) -> None:
+    """Test chunked normalization with characters and CRLF split across chunks."""
+    monkeypatch.setattr("filecombinator.core.file_utils._COPY_CHUNK_SIZE", 3)
+    source = tmp_path / "source.txt"
+    source.write_bytes(content)
+    output = io.BytesIO()
+
+    copy_normalized_text(str(source), output)
+
+    assert output.getvalue() == normalize_text(content)
+
+
+def test_copy_normalized_text_memory_mapped(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test that large bodies are normalized from a memory map."""
+    monkeypatch.setattr("filecombinator.core.file_utils._COPY_CHUNK_SIZE", 3)
+    content = "a\u00e9\r\n\u20ac\r".encode("utf-8") * 100
+    source = tmp_path / "large.txt"
+    source.write_bytes(content)
+    output = io.BytesIO()
+
+    with patch("mmap.mmap", wraps=mmap.mmap) as mock_mmap:
+        monkeypatch.setattr("filecombinator.core.file_utils._MMAP_THRESHOLD", 0)
+        copy_normalized_text(str(source), output)
+
+    assert mock_mmap.call_count == 1
+    assert output.getvalue() == normalize_text(content)
+
+
+@pytest.mark.skipif(not hasattr(os, "posix_fadvise"), reason="needs posix_fadvise")
+def test_copy_normalized_text_access_hints(tmp_path: Path) -> None:
+    """Test that large bodies are read ahead sequentially, then dropped."""
+    source = tmp_path / "large.txt"
+    size = 2 * 1024 * 1024
+    source.write_bytes(b"x" * size)
+
+    with patch("os.posix_fadvise") as mock_fadvise:
+        copy_normalized_text(str(source), io.BytesIO())
+
+    advices = [call.args[1:] for call in mock_fadvise.call_args_list]
+    assert advices == [
+        (0, 0, os.POSIX_FADV_SEQUENTIAL),
+        (0, size, os.POSIX_FADV_WILLNEED),
+        (0, size, os.POSIX_FADV_DONTNEED),
+    ]
+
+
+@pytest.mark.parametrize("content", [b"ok\xc3", b"\xc3" + b"a" * 10 + b"\xa9"])
+def test_copy_normalized_text_invalid_utf8(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, content: bytes
 ) -> None:
-    """Test SafeOpen context manager exception handling."""
-    file_obj = None
-    try:
-        with SafeOpen(temp_files["text"], "r") as f:
-            file_obj = f
-            assert not f.closed  # File should be open within the context
-            raise ValueError("Test exception")
-    except ValueError:
-        assert file_obj is not None
-        assert (
-            file_obj.closed
-        )  # File should be closed after context, even with exception
+    """Test that invalid UTF-8 is rejected while copying."""
+    monkeypatch.setattr("filecombinator.core.file_utils._COPY_CHUNK_SIZE", 3)
+    source = tmp_path / "source.txt"
+    source.write_bytes(content)
+
+    with pytest.raises(UnicodeDecodeError):
+        copy_normalized_text(str(source), io.BytesIO())
 
 
 def test_file_type_detector_initialization() -> None:
@@ -109,19 +184,181 @@ def test_file_type_detector_initialization() -> None:
     assert ".exe" in detector.BINARY_EXTENSIONS
 
 
-def test_is_image_file(temp_files: dict[str, str]) -> None:
-    """Test image file detection."""
+@pytest.fixture(scope="module")
+def classification_env(
+    tmp_path_factory: pytest.TempPathFactory,
+) -> tuple[dict[str, str], FileTypeDetector]:
+    """Create the sample files and a detector once for the classification tests.
+
+    Returns:
+        Tuple of (paths of the sample files by key, detector)
+    """
+    files = write_sample_files(tmp_path_factory.mktemp("classification"))
+    return files, FileTypeDetector()
+
+
+class TestFileClassification:
+    """Classification of the sample files by one shared detector."""
+
+    @pytest.mark.parametrize(
+        "key,expected", [("image", True), ("text", False), ("binary", False)]
+    )
+    def test_is_image_file(
+        self,
+        classification_env: tuple[dict[str, str], FileTypeDetector],
+        key: str,
+        expected: bool,
+    ) -> None:
+        """Test image file detection."""
+        files, detector = classification_env
+        assert detector.is_image_file(files[key]) is expected
+
+    @pytest.mark.parametrize(
+        "key,expected",
+        [("binary", True), ("text", False), ("xml", False), ("json", False)],
+    )
+    def test_is_binary_file(
+        self,
+        classification_env: tuple[dict[str, str], FileTypeDetector],
+        key: str,
+        expected: bool,
+    ) -> None:
+        """Test binary file detection, including XML and JSON as text."""
+        files, detector = classification_env
+        assert detector.is_binary_file(files[key]) is expected
+
+    @pytest.mark.parametrize(
+        "key,expected", [("text", "Text"), ("binary", "Binary"), ("image", "Image")]
+    )
+    def test_detect_file_type(
+        self,
+        classification_env: tuple[dict[str, str], FileTypeDetector],
+        key: str,
+        expected: str,
+    ) -> None:
+        """Test combined file type detection."""
+        files, detector = classification_env
+        assert detector.detect_file_type(files[key]) == expected
+
+
+def test_is_image_file_known_extensions_skip_magic(tmp_path: Path) -> None:
+    """Test that known extensions decide image checks without libmagic."""
+    (tmp_path / "script.py").write_text("print('hi')")
+    (tmp_path / "lib.so").write_bytes(b"\x7fELF")
+
     detector = FileTypeDetector()
-    assert detector.is_image_file(temp_files["image"])
-    assert not detector.is_image_file(temp_files["text"])
-    assert not detector.is_image_file(temp_files["binary"])
+    with patch.object(detector, "mime") as mock_mime:
+        assert detector.is_image_file(tmp_path / "photo.jpg")
+        assert not detector.is_image_file(tmp_path / "script.py")
+        assert not detector.is_image_file(tmp_path / "lib.so")
+
+    mock_mime.from_file.assert_not_called()
+    mock_mime.from_buffer.assert_not_called()
 
 
-def test_is_binary_file(temp_files: dict[str, str]) -> None:
-    """Test binary file detection."""
+def test_detect_file_type_by_extension_skips_reads(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test that known extensions are classified without opening the file."""
+    (tmp_path / "photo.PNG").write_bytes(b"\x89PNG\x00")
+    (tmp_path / "archive.zip").write_text("not really a zip")
+
+    def fail_open(*args: object, **kwargs: object) -> None:
+        raise AssertionError("file should not be opened")
+
     detector = FileTypeDetector()
-    assert detector.is_binary_file(temp_files["binary"])
-    assert not detector.is_binary_file(temp_files["text"])
+    monkeypatch.setattr("filecombinator.core.file_utils.os.open", fail_open)
+    monkeypatch.setattr(detector, "mime", None)
+
+    assert detector.detect_file_type(tmp_path / "photo.PNG") == "Image"
+    assert detector.detect_file_type(tmp_path / "archive.zip") == "Binary"
+
+
+@pytest.mark.parametrize(
+    "name, content, mime_type, expected",
+    [
+        ("drawing.svgz", b"<svg></svg>", "image/svg+xml", "Image"),
+        ("blob.dat", b"\x00\x01\x02", "application/octet-stream", "Binary"),
+        ("notes.cfg", b"key = value", "text/plain", "Text"),
+    ],
+)
+def test_detect_file_type_single_mime_lookup(
+    tmp_path: Path, name: str, content: bytes, mime_type: str, expected: str
+) -> None:
+    """Test that unknown extensions consult libmagic exactly once."""
+    file_path = tmp_path / name
+    file_path.write_bytes(content)
+
+    detector = FileTypeDetector()
+    with patch.object(detector, "mime") as mock_mime:
+        mock_mime.from_file.return_value = mime_type
+        assert detector.detect_file_type(file_path) == expected
+
+    assert mock_mime.from_file.call_count == 1
+
+
+def test_mime_type_cached_per_physical_file(tmp_path: Path) -> None:
+    """Test that libmagic parses an unchanged file only once."""
+    file_path = tmp_path / "data.unknown"
+    file_path.write_text("plain words")
+
+    detector = FileTypeDetector()
+    with patch.object(detector, "mime") as mock_mime:
+        mock_mime.from_file.return_value = "application/octet-stream"
+        detector.is_binary_file(file_path)
+        assert not detector.is_image_file(file_path)
+        assert mock_mime.from_file.call_count == 1
+
+        file_path.write_text("more plain words")
+        detector.is_image_file(file_path)
+        assert mock_mime.from_file.call_count == 2
+
+
+def test_mime_type_cached_per_source(tmp_path: Path) -> None:
+    """Test that header-only and whole-file answers are cached separately."""
+    file_path = tmp_path / "data.unknown"
+    file_path.write_text("plain words")
+    entry = CachedEntry(file_path)
+
+    detector = FileTypeDetector()
+    with patch.object(detector, "mime") as mock_mime:
+        mock_mime.from_buffer.return_value = "text/plain"
+        mock_mime.from_file.return_value = "image/x-unknown"
+        for _ in range(2):
+            assert detector._mime_type(entry, b"plain words") == "text/plain"
+            assert detector._mime_type(entry, None) == "image/x-unknown"
+
+    assert mock_mime.from_buffer.call_count == 1
+    assert mock_mime.from_file.call_count == 1
+
+
+def test_binary_detection_reads_probe_only(tmp_path: Path) -> None:
+    """Test that content analysis only inspects the leading probe."""
+    late_nul = tmp_path / "late_nul.txt"
+    late_nul.write_bytes(b"a" * PROBE_SIZE + b"\x00")
+    early_nul = tmp_path / "early_nul.txt"
+    early_nul.write_bytes(b"a" * (PROBE_SIZE - 1) + b"\x00")
+
+    detector = FileTypeDetector()
+    assert not detector.is_binary_file(late_nul)
+    assert detector.is_binary_file(early_nul)
+
+
+def test_binary_detection_multibyte_at_probe_boundary(tmp_path: Path) -> None:
+    """Test that a character split by the probe boundary is not binary."""
+    split = tmp_path / "split.txt"
+    split.write_bytes(b"a" * (PROBE_SIZE - 1) + "\u00e9".encode("utf-8"))
+    truncated = tmp_path / "truncated.txt"
+    truncated.write_bytes(b"a" * 10 + "\u00e9".encode("utf-8")[:1])
+    # A whole file of exactly PROBE_SIZE bytes cut inside a character
+    truncated_at_probe = tmp_path / "truncated_at_probe.txt"
+    truncated_at_probe.write_bytes(b"a" * (PROBE_SIZE - 1) + b"\xc3")
+
+    detector = FileTypeDetector()
+    assert not detector.is_binary_file(split)
+    assert detector.is_binary_file(truncated)
+    assert detector.is_binary_file(truncated_at_probe)
+    assert detector.detect_file_type(truncated_at_probe) == "Binary"
 
 
 def test_binary_detection_error() -> None:
@@ -156,13 +393,6 @@ def test_is_binary_file_without_magic(
     assert detector.is_binary_file(temp_files["binary"])
 
 
-def test_xml_json_detection(temp_files: dict[str, str]) -> None:
-    """Test detection of XML and JSON files as text."""
-    detector = FileTypeDetector()
-    assert not detector.is_binary_file(temp_files["xml"])
-    assert not detector.is_binary_file(temp_files["json"])
-
-
 def test_mime_initialization_error(monkeypatch: pytest.MonkeyPatch) -> None:
     """Test FileTypeDetector initialization when magic fails."""
 
@@ -172,3 +402,20 @@ def test_mime_initialization_error(monkeypatch: pytest.MonkeyPatch) -> None:
     monkeypatch.setattr(magic.Magic, "__init__", mock_magic_init)
     detector = FileTypeDetector()
     assert detector.mime is None
+
+
+@pytest.mark.parametrize(
+    "name,expected",
+    [
+        ("a.PY", ".py"),
+        ("x.tar.gz", ".gz"),
+        ("noext", ""),
+        (".bashrc", ""),
+        ("..foo", ""),
+        ("trailing.", "."),
+    ],
+)
+def test_file_extension_matches_splitext(name: str, expected: str) -> None:
+    """Test extension extraction agrees with os.path.splitext."""
+    assert file_extension(name) == expected
+    assert file_extension(name) == os.path.splitext(name)[1].lower()
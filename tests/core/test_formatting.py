@@ -2,15 +2,18 @@
 """Test suite for FileCombinator output formatting functionality."""
 
 import os
-from io import StringIO
+from io import BytesIO
+from pathlib import Path
+from unittest.mock import patch
 
 from filecombinator.core.formatting import FormatProcessor
+from filecombinator.core.models import FileSection
 
 
 def test_ai_instructions_header_content() -> None:
     """Test that AI instructions match the template file."""
     processor = FormatProcessor()
-    output = StringIO()
+    output = BytesIO()
 
     # Get the template content directly from the file
     template_path = os.path.join(
@@ -21,10 +24,68 @@ def test_ai_instructions_header_content() -> None:
         "ai_instructions.md",
     )
 
-    with open(template_path, "r", encoding="utf-8") as f:
+    with open(template_path, "rb") as f:
         expected_content = f.read()
 
     processor.write_header(output)
     actual_content = output.getvalue()
 
     assert actual_content.strip() == expected_content.strip()
+
+
+def test_write_file_section_streams_body_to_end(tmp_path: Path) -> None:
+    """Test that a streamed body is normalized and copied up to end of file."""
+    body = tmp_path / "body.txt"
+    body.write_bytes(b"Body\r\ncontent")
+
+    processor = FormatProcessor()
+    output = BytesIO()
+    section = FileSection(
+        file_type="Text", head=b"head\n", tail=b"\ntail", body_path=str(body)
+    )
+    # Content appended after rendering is copied as well
+    with open(body, "ab") as f:
+        f.write(b"\r\nmore")
+    processor.write_file_section(section, output)
+
+    assert output.getvalue() == b"head\nBody\ncontent\nmore\ntail"
+
+
+def test_render_file_section_opens_file_once(tmp_path: Path) -> None:
+    """Test that detection and reading of a text file share one descriptor."""
+    text_file = tmp_path / "notes.txt"
+    content = "\u00e9" * 6000 + "\r\nend"
+    text_file.write_bytes(content.encode("utf-8"))
+
+    processor = FormatProcessor()
+    with patch("filecombinator.core.formatting.os.open", wraps=os.open) as mock_open:
+        section = processor.render_file_section(text_file)
+
+    assert mock_open.call_count == 1
+    assert section.file_type == "Text"
+    assert section.body_path is None
+    assert section.head.endswith(("\u00e9" * 6000 + "\nend").encode("utf-8"))
+
+
+def test_render_file_section_known_text_extension(tmp_path: Path) -> None:
+    """Test that text extensions skip the probe, and large bodies any read."""
+    small = tmp_path / "small.py"
+    small.write_text("print('hi')\n")
+    large = tmp_path / "large.py"
+    large.write_text("x = 1\n" * 20000)
+
+    processor = FormatProcessor()
+    with patch.object(processor.file_type_detector, "detect_file_type") as detect:
+        with patch(
+            "filecombinator.core.formatting.os.open", wraps=os.open
+        ) as mock_open:
+            small_section = processor.render_file_section(small)
+            assert mock_open.call_count == 1
+            large_section = processor.render_file_section(large)
+            assert mock_open.call_count == 1
+
+    detect.assert_not_called()
+    assert small_section.head.endswith(b"print('hi')\n")
+    assert small_section.body_path is None
+    assert large_section.file_type == "Text"
+    assert large_section.body_path == str(large)
@@ -3,7 +3,7 @@
 
 import logging
 import os
-import tempfile
+from pathlib import Path
 from typing import Generator
 
 import pytest
@@ -31,21 +31,20 @@ def test_setup_logging() -> None:
 
 
 @pytest.mark.usefixtures("clean_logging")
-def test_setup_logging_with_file() -> None:
+def test_setup_logging_with_file(tmp_path: Path) -> None:
     """Test logging setup with file output."""
-    with tempfile.TemporaryDirectory() as tmpdir:
-        log_file = os.path.join(tmpdir, "test.log")
-        logger = setup_logging(log_file, verbose=True)
-
-        assert logger.level == logging.DEBUG
-        assert len(logger.handlers) > 1  # Console and file handlers
-        assert any(isinstance(h, logging.StreamHandler) for h in logger.handlers)
-        assert any(
-            isinstance(h, logging.handlers.RotatingFileHandler) for h in logger.handlers
-        )
-
-        # Verify log file was created
-        assert os.path.exists(log_file)
+    log_file = os.path.join(tmp_path, "test.log")
+    logger = setup_logging(log_file, verbose=True)
+
+    assert logger.level == logging.DEBUG
+    assert len(logger.handlers) > 1  # Console and file handlers
+    assert any(isinstance(h, logging.StreamHandler) for h in logger.handlers)
+    assert any(
+        isinstance(h, logging.handlers.RotatingFileHandler) for h in logger.handlers
+    )
+
+    # Verify log file was created
+    assert os.path.exists(log_file)
 
 
 @pytest.mark.usefixtures("clean_logging")
@@ -40,3 +40,9 @@ def test_file_lists_append() -> None:
     assert "test.txt" in lists.text
     assert "test.bin" in lists.binary
     assert "test.jpg" in lists.image
+
+
+def test_models_use_slots() -> None:
+    """Test that the models store fields in slots instead of a __dict__."""
+    for model in (FileStats(), FileLists()):
+        assert not hasattr(model, "__dict__")
@@ -0,0 +1,22 @@
+# tests/helpers.py
+"""Shared assertion helpers for the FileCombinator test suite."""
+
+from pathlib import Path
+from typing import Iterable
+
+
+def assert_contains(
+    path: str | Path, must: Iterable[str], must_not: Iterable[str] = ()
+) -> None:
+    """Assert which substrings a file contains, reading it only once.
+
+    Args:
+        path: Path of the file to check
+        must: Substrings that must appear in the file
+        must_not: Substrings that must not appear in the file
+    """
+    text = Path(path).read_text(encoding="utf-8")
+    for expected in must:
+        assert expected in text, f"{expected!r} not found in {path}"
+    for unexpected in must_not:
+        assert unexpected not in text, f"{unexpected!r} found in {path}"
@@ -3,6 +3,7 @@
 
 import io
 import logging
+import mmap
 import os
 from pathlib import Path
 from typing import Generator
@@ -152,11 +153,11 @@ def test_track_same_file_twice(test_files: dict[str, Path]) -> None:
 def test_process_text_file(test_files: dict[str, Path]) -> None:
     """Test processing a text file."""
     processor = ContentProcessor()
-    output = io.StringIO()
+    output = io.BytesIO()
 
     processor.process_file(str(test_files["text"]), output)
 
-    content = output.getvalue()
+    content = output.getvalue().decode("utf-8")
     assert "Test content" in content
     assert "Type: Text" in content
 
@@ -164,11 +165,11 @@ def test_process_text_file(test_files: dict[str, Path]) -> None:
 def test_process_binary_file(test_files: dict[str, Path]) -> None:
     """Test processing a binary file."""
     processor = ContentProcessor()
-    output = io.StringIO()
+    output = io.BytesIO()
 
     processor.process_file(str(test_files["binary"]), output)
 
-    content = output.getvalue()
+    content = output.getvalue().decode("utf-8")
     assert "BINARY FILE (CONTENT EXCLUDED)" in content
     assert "Type: Binary" in content
 
@@ -176,11 +177,11 @@ def test_process_binary_file(test_files: dict[str, Path]) -> None:
 def test_process_image_file(test_files: dict[str, Path]) -> None:
     """Test processing an image file."""
     processor = ContentProcessor()
-    output = io.StringIO()
+    output = io.BytesIO()
 
     processor.process_file(str(test_files["image"]), output)
 
-    content = output.getvalue()
+    content = output.getvalue().decode("utf-8")
     assert "IMAGE FILE (CONTENT EXCLUDED)" in content
     assert "Type: Image" in content
 
@@ -188,11 +189,11 @@ def test_process_image_file(test_files: dict[str, Path]) -> None:
 def test_process_unicode_file(test_files: dict[str, Path]) -> None:
     """Test processing a file with unicode content."""
     processor = ContentProcessor()
-    output = io.StringIO()
+    output = io.BytesIO()
 
     processor.process_file(str(test_files["unicode"]), output)
 
-    content = output.getvalue()
+    content = output.getvalue().decode("utf-8")
     assert "Unicode ♥ content ☺" in content
     assert "Type: Text" in content
 
@@ -200,11 +201,11 @@ def test_process_unicode_file(test_files: dict[str, Path]) -> None:
 def test_process_empty_file(test_files: dict[str, Path]) -> None:
     """Test processing an empty file."""
     processor = ContentProcessor()
-    output = io.StringIO()
+    output = io.BytesIO()
 
     processor.process_file(str(test_files["empty"]), output)
 
-    content = output.getvalue()
+    content = output.getvalue().decode("utf-8")
     assert "Size: 0 bytes" in content
     # An empty file should be treated as text
     assert "Type: Text" in content
@@ -213,19 +214,54 @@ def test_process_empty_file(test_files: dict[str, Path]) -> None:
 def test_process_nested_file(test_files: dict[str, Path]) -> None:
     """Test processing a file in a nested directory."""
     processor = ContentProcessor()
-    output = io.StringIO()
+    output = io.BytesIO()
 
     processor.process_file(str(test_files["nested"]), output)
 
-    content = output.getvalue()
+    content = output.getvalue().decode("utf-8")
     assert "Nested content" in content
     assert "Type: Text" in content
 
 
+def test_process_large_file_into_real_file(tmp_path: Path) -> None:
+    """Test that large text bodies are copied byte for byte from a memory map."""
+    large = tmp_path / "large.txt"
+    body = "line \u2713\n" * 40000
+    large.write_text(body, encoding="utf-8")
+
+    processor = ContentProcessor()
+    with open(tmp_path / "out.txt", "w+b") as output, patch(
+        "mmap.mmap", wraps=mmap.mmap
+    ) as mock_mmap:
+        processor.process_file(str(large), output)
+        output.seek(0)
+        content = output.read().decode("utf-8")
+
+    assert mock_mmap.call_count == 1
+    assert body + "\n" + "=" * 18 + " END OF FILE" in content
+    assert processor.stats.processed == 1
+
+
+@pytest.mark.parametrize("lines", [10, 20000])
+def test_process_crlf_file_normalized_at_any_size(tmp_path: Path, lines: int) -> None:
+    """Test that CRLF bodies are normalized whether they are read or copied."""
+    crlf = tmp_path / "crlf.txt"
+    crlf.write_bytes(b"line \xe2\x9c\x93\r\n" * lines)
+
+    processor = ContentProcessor()
+    with open(tmp_path / "out.txt", "w+b") as output:
+        processor.process_file(str(crlf), output)
+        output.seek(0)
+        content = output.read()
+
+    assert b"\r" not in content
+    assert b"line \xe2\x9c\x93\n" * lines + b"\n" + b"=" * 18 + b" END" in content
+
+
 def test_process_nonexistent_file() -> None:
     """Test processing a nonexistent file."""
     processor = ContentProcessor()
-    output = io.StringIO()
+    output = io.BytesIO()
 
     with pytest.raises(FileProcessingError) as exc_info:
         processor.process_file("nonexistent.txt", output)
@@ -236,7 +272,7 @@ def test_process_nonexistent_file() -> None:
 def test_process_unreadable_file(test_files: dict[str, Path]) -> None:
     """Test processing a file that can't be read."""
     processor = ContentProcessor()
-    output = io.StringIO()
+    output = io.BytesIO()
 
     # Make file unreadable
     file_path = test_files["text"]
@@ -283,7 +319,7 @@ def test_get_file_info_success(test_files: dict[str, Path]) -> None:
 def test_process_file_with_unicode_error(test_files: dict[str, Path]) -> None:
     """Test handling of Unicode decoding errors."""
     processor = ContentProcessor()
-    output = io.StringIO()
+    output = io.BytesIO()
 
     with patch("builtins.open") as mock_file:
         mock_file.side_effect = UnicodeDecodeError("utf-8", b"test", 0, 1, "test error")
@@ -291,3 +327,31 @@ def test_process_file_with_unicode_error(test_files: dict[str, Path]) -> None:
             processor.process_file(str(test_files["text"]), output)
 
     assert "test error" in str(exc_info.value)
+
+
+class _UnseekableBytesIO(io.BytesIO):
+    """In-memory output that reports itself as unseekable, like a pipe."""
+
+    def seekable(self) -> bool:
+        """Report the stream as unseekable."""
+        return False
+
+
+@pytest.mark.parametrize("output_type", [io.BytesIO, _UnseekableBytesIO])
+def test_process_large_invalid_file_writes_no_partial_body(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, output_type: type[io.BytesIO]
+) -> None:
+    """Test that a body failing past its first chunk leaves no partial copy."""
+    monkeypatch.setattr("filecombinator.core.file_utils._COPY_CHUNK_SIZE", 4096)
+    invalid = tmp_path / "invalid.txt"
+    invalid.write_bytes(b"valid line\n" * 10000 + b"\xff")
+
+    processor = ContentProcessor()
+    output = output_type()
+    with pytest.raises(FileProcessingError):
+        processor.process_file(str(invalid), output)
+
+    content = output.getvalue()
+    assert b"valid line" not in content
+    assert b" START OF FILE " + b"=" * 18 + b"\nError reading file: " in content
+    assert processor.stats.skipped == 1
@@ -1,51 +1,52 @@
 # tests/processors/test_directory.py
 """Test suite for DirectoryProcessor."""
 
+import contextlib
+import fnmatch
 import logging
 import os
-import tempfile
 from pathlib import Path
-from typing import Any, Generator, Set
+from typing import Any, Iterator
+from unittest.mock import patch
 
 import pytest
 
 from filecombinator.core.exceptions import DirectoryProcessingError
+from filecombinator.core.file_utils import CachedEntry
 from filecombinator.processors.directory import DirectoryProcessor
 
 logger = logging.getLogger(__name__)
 
+# Exclude patterns shared by the processor fixture and the exclusion cases
+EXCLUDED = frozenset({"__pycache__", ".git"})
+
 
 @pytest.fixture
-def test_directory() -> Generator[dict[str, Any], None, None]:
+def test_directory(tmp_path: Path) -> dict[str, Any]:
     """Create a test directory structure.
 
     Returns:
         Dictionary with test directory information
     """
-    with tempfile.TemporaryDirectory() as tmpdir:
-        # Create some test files and directories
-        os.makedirs(os.path.join(tmpdir, "subdir"))
-        os.makedirs(os.path.join(tmpdir, "__pycache__"))
-        os.makedirs(os.path.join(tmpdir, ".git"))
+    # Create some test files and directories
+    (tmp_path / "subdir").mkdir()
+    (tmp_path / "__pycache__").mkdir()
+    (tmp_path / ".git").mkdir()
 
-        with open(os.path.join(tmpdir, "test1.txt"), "w") as f:
-            f.write("test1")
-        with open(os.path.join(tmpdir, "subdir", "test2.txt"), "w") as f:
-            f.write("test2")
-        with open(os.path.join(tmpdir, "__pycache__", "test.pyc"), "w") as f:
-            f.write("cache")
+    (tmp_path / "test1.txt").write_text("test1")
+    (tmp_path / "subdir" / "test2.txt").write_text("test2")
+    (tmp_path / "__pycache__" / "test.pyc").write_text("cache")
 
-        yield {
-            "path": tmpdir,
-            "files": ["test1.txt", "subdir/test2.txt", "__pycache__/test.pyc"],
-        }
+    return {
+        "path": str(tmp_path),
+        "files": ["test1.txt", "subdir/test2.txt", "__pycache__/test.pyc"],
+    }
 
 
 @pytest.fixture
 def processor() -> DirectoryProcessor:
     """Create a DirectoryProcessor instance."""
-    exclude_patterns: Set[str] = {"__pycache__", ".git"}
-    return DirectoryProcessor(exclude_patterns=exclude_patterns)
+    return DirectoryProcessor(exclude_patterns=set(EXCLUDED))
 
 
 def test_directory_processor_initialization(processor: DirectoryProcessor) -> None:
@@ -54,12 +55,21 @@ def test_directory_processor_initialization(processor: DirectoryProcessor) -> No
     assert ".git" in processor.exclude_patterns
 
 
-def test_is_excluded(processor: DirectoryProcessor) -> None:
+@pytest.mark.parametrize(
+    "path,expected",
+    [
+        (Path("__pycache__/test.pyc"), True),
+        (Path(".git/config"), True),
+        (Path("src/__pycache__/mod.pyc"), True),
+        (Path("test.txt"), False),
+        (Path("subdir/test.txt"), False),
+        (Path(".gitignore"), False),
+        (Path("git/config"), False),
+    ],
+)
+def test_is_excluded(processor: DirectoryProcessor, path: Path, expected: bool) -> None:
     """Test path exclusion checks."""
-    assert processor.is_excluded(Path("__pycache__/test.pyc"))
-    assert processor.is_excluded(Path(".git/config"))
-    assert not processor.is_excluded(Path("test.txt"))
-    assert not processor.is_excluded(Path("subdir/test.txt"))
+    assert processor.is_excluded(path) is expected
 
 
 def test_is_excluded_output_file(processor: DirectoryProcessor) -> None:
@@ -75,7 +85,7 @@ def test_process_directory(
     """Test directory processing."""
     processed_files = []
 
-    def callback(file_path: str) -> None:
+    def callback(file_path: CachedEntry) -> None:
         processed_files.append(os.path.relpath(file_path, test_directory["path"]))
 
     processor.process_directory(test_directory["path"], callback)
@@ -111,58 +121,51 @@ def test_generate_tree(
     assert "│   " in tree_content
 
 
-def test_generate_tree_empty_directory() -> None:
+def test_generate_tree_empty_directory(tmp_path: Path) -> None:
     """Test tree content generation with empty directory."""
-    with tempfile.TemporaryDirectory() as tmpdir:
-        processor = DirectoryProcessor(set())
-        tree_content = processor.generate_tree(tmpdir)
-        assert tree_content == ""
+    processor = DirectoryProcessor(set())
+    tree_content = processor.generate_tree(str(tmp_path))
+    assert tree_content == ""
 
 
-def test_generate_tree_single_file() -> None:
+def test_generate_tree_single_file(tmp_path: Path) -> None:
     """Test tree content generation with a single file."""
-    with tempfile.TemporaryDirectory() as tmpdir:
-        # Create a single test file
-        test_file = os.path.join(tmpdir, "test.txt")
-        with open(test_file, "w") as f:
-            f.write("test")
+    # Create a single test file
+    (tmp_path / "test.txt").write_text("test")
 
-        processor = DirectoryProcessor(set())
-        tree_content = processor.generate_tree(tmpdir)
-        assert "└── test.txt" in tree_content
+    processor = DirectoryProcessor(set())
+    tree_content = processor.generate_tree(str(tmp_path))
+    assert "└── test.txt" in tree_content
 
 
-def test_generate_tree_nested_directories() -> None:
+def test_generate_tree_nested_directories(tmp_path: Path) -> None:
     """Test tree content generation with nested directories."""
-    with tempfile.TemporaryDirectory() as tmpdir:
-        # Create nested directory structure with multiple paths to force vertical lines
-        os.makedirs(os.path.join(tmpdir, "dir1", "dir2"))
-        os.makedirs(os.path.join(tmpdir, "dir1", "dir3"))  # Add sibling directory
-
-        # Add files in different directories
-        with open(os.path.join(tmpdir, "dir1", "dir2", "test1.txt"), "w") as f:
-            f.write("test1")
-        with open(os.path.join(tmpdir, "dir1", "dir3", "test2.txt"), "w") as f:
-            f.write("test2")
-
-        processor = DirectoryProcessor(set())
-        tree_content = processor.generate_tree(tmpdir)
-
-        # Output should look like:
-        # tmpXXX
-        # └── dir1
-        #     ├── dir2
-        #     │   └── test1.txt
-        #     └── dir3
-        #         └── test2.txt
-
-        assert "dir1" in tree_content
-        assert "dir2" in tree_content
-        assert "dir3" in tree_content
-        assert "test1.txt" in tree_content
-        assert "test2.txt" in tree_content
-        assert "├── " in tree_content  # Has branching
-        assert "│   " in tree_content  # Has vertical line
+    # Create nested directory structure with multiple paths to force vertical lines
+    (tmp_path / "dir1" / "dir2").mkdir(parents=True)
+    (tmp_path / "dir1" / "dir3").mkdir()  # Add sibling directory
+
+    # Add files in different directories
+    (tmp_path / "dir1" / "dir2" / "test1.txt").write_text("test1")
+    (tmp_path / "dir1" / "dir3" / "test2.txt").write_text("test2")
+
+    processor = DirectoryProcessor(set())
+    tree_content = processor.generate_tree(str(tmp_path))
+
+    # Output should look like:
+    # tmpXXX
+    # └── dir1
+    #     ├── dir2
+    #     │   └── test1.txt
+    #     └── dir3
+    #         └── test2.txt
+
+    assert "dir1" in tree_content
+    assert "dir2" in tree_content
+    assert "dir3" in tree_content
+    assert "test1.txt" in tree_content
+    assert "test2.txt" in tree_content
+    assert "├── " in tree_content  # Has branching
+    assert "│   " in tree_content  # Has vertical line
 
 
 def test_generate_tree_error(processor: DirectoryProcessor) -> None:
@@ -181,7 +184,7 @@ def test_process_directory_error_processing_file(tmp_path: Path) -> None:
     test_file.write_text("test content")
 
     # Create a callback that raises an error
-    def failing_callback(file_path: str) -> None:
+    def failing_callback(file_path: CachedEntry) -> None:
         raise OSError("Test error processing file")
 
     # Ensure the error is propagated properly
@@ -204,7 +207,7 @@ def test_process_directory_with_subdirectories(tmp_path: Path) -> None:
     # Track processed files
     processed_files = []
 
-    def callback(file_path: str) -> None:
+    def callback(file_path: CachedEntry) -> None:
         processed_files.append(os.path.basename(file_path))
 
     # Process directory
@@ -215,6 +218,27 @@ def test_process_directory_with_subdirectories(tmp_path: Path) -> None:
     assert processed_files == ["file1.txt", "file2.txt"]
 
 
+def test_iter_files_depth_first_name_order(tmp_path: Path) -> None:
+    """Test that files precede subdirectories, visited depth-first by name."""
+    for rel in ["b/y.txt", "b/a/x.txt", "a/z/w.txt", "a/v.txt", "c.txt"]:
+        (tmp_path / rel).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / rel).write_text(rel)
+
+    processor = DirectoryProcessor(set())
+    paths = [
+        os.path.relpath(entry.path, tmp_path)
+        for entry in processor.iter_files(tmp_path)
+    ]
+
+    assert paths == [
+        "c.txt",
+        os.path.join("a", "v.txt"),
+        os.path.join("a", "z", "w.txt"),
+        os.path.join("b", "y.txt"),
+        os.path.join("b", "a", "x.txt"),
+    ]
+
+
 def test_process_directory_with_empty_subdirectories(tmp_path: Path) -> None:
     """Test processing directory with empty subdirectories."""
     # Create empty subdirectories
@@ -226,7 +250,7 @@ def test_process_directory_with_empty_subdirectories(tmp_path: Path) -> None:
 
     processed_files = []
 
-    def callback(file_path: str) -> None:
+    def callback(file_path: CachedEntry) -> None:
         processed_files.append(os.path.basename(file_path))
 
     processor = DirectoryProcessor(set())
@@ -234,3 +258,263 @@ def test_process_directory_with_empty_subdirectories(tmp_path: Path) -> None:
 
     # Only the text file should be processed
     assert processed_files == ["test.txt"]
+
+
+def test_process_directory_passes_cached_entries(tmp_path: Path) -> None:
+    """Test that callbacks receive cached entries and symlinked dirs are skipped."""
+    (tmp_path / "real").mkdir()
+    (tmp_path / "real" / "file.txt").write_text("test")
+    (tmp_path / "link").symlink_to(tmp_path / "real", target_is_directory=True)
+
+    entries: list[CachedEntry] = []
+
+    processor = DirectoryProcessor(set())
+    processor.process_directory(str(tmp_path), entries.append)
+
+    assert all(isinstance(entry, CachedEntry) for entry in entries)
+    assert [entry.name for entry in entries] == ["file.txt"]
+    assert entries[0].path == str(tmp_path / "real" / "file.txt")
+
+
+def test_process_directory_sort_by_inode(test_directory: dict[str, Any]) -> None:
+    """Test that inode-ordered stat prefetching keeps name order."""
+    processed_files: list[str] = []
+
+    def callback(entry: CachedEntry) -> None:
+        processed_files.append(os.path.relpath(entry.path, test_directory["path"]))
+
+    processor = DirectoryProcessor({"__pycache__", ".git"}, sort_by_inode=True)
+    processor.process_directory(test_directory["path"], callback)
+
+    assert processed_files == ["test1.txt", os.path.join("subdir", "test2.txt")]
+
+
+class _RecordingEntry:
+    """Directory entry wrapper with a fixed inode that records stat calls."""
+
+    def __init__(self, entry: os.DirEntry[str], inode: int, calls: list[str]) -> None:
+        """Wrap a scanned entry, reporting the given inode number."""
+        self._entry = entry
+        self._inode = inode
+        self._calls = calls
+        self.name = entry.name
+        self.path = entry.path
+
+    def inode(self) -> int:
+        """Get the fixed inode number."""
+        return self._inode
+
+    def is_dir(self, *, follow_symlinks: bool = True) -> bool:
+        """Check if the wrapped entry is a directory."""
+        return self._entry.is_dir(follow_symlinks=follow_symlinks)
+
+    def stat(self, *, follow_symlinks: bool = True) -> os.stat_result:
+        """Record the call and stat the wrapped entry."""
+        self._calls.append(self.name)
+        return self._entry.stat(follow_symlinks=follow_symlinks)
+
+
+@pytest.mark.skipif(os.name == "nt", reason="inode order is ignored on Windows")
+@pytest.mark.parametrize(
+    "sort_by_inode, expected_calls", [(True, ["b.txt", "c.txt", "a.txt"]), (False, [])]
+)
+def test_scan_stats_files_in_inode_order(
+    tmp_path: Path, sort_by_inode: bool, expected_calls: list[str]
+) -> None:
+    """Test that files are stat'ed in inode order before they are processed."""
+    inodes = {"a.txt": 30, "b.txt": 10, "c.txt": 20}
+    for name in inodes:
+        (tmp_path / name).write_text(name)
+    calls: list[str] = []
+    real_scandir = os.scandir
+
+    @contextlib.contextmanager
+    def recording_scandir(path: str) -> Iterator[list[_RecordingEntry]]:
+        with real_scandir(path) as it:
+            yield [_RecordingEntry(e, inodes[e.name], calls) for e in it]
+
+    processor = DirectoryProcessor(set(), sort_by_inode=sort_by_inode)
+    with patch("filecombinator.processors.directory.os.scandir", recording_scandir):
+        _, files = processor.scan(tmp_path)
+
+    assert calls == expected_calls
+    assert [entry.name for entry in files] == ["a.txt", "b.txt", "c.txt"]
+
+
+def test_is_excluded_glob_patterns() -> None:
+    """Test that exclude patterns support shell-style wildcards."""
+    processor = DirectoryProcessor({"*.log", "build*"})
+
+    assert processor.is_excluded(Path("logs/debug.log"))
+    assert processor.is_excluded(Path("build-output/file.txt"))
+    assert not processor.is_excluded(Path("src/log.txt"))
+    assert not processor.is_excluded(Path("src/rebuild.py"))
+
+
+def test_exclude_patterns_update() -> None:
+    """Test that replacing the exclude patterns recompiles the matcher."""
+    processor = DirectoryProcessor(set())
+    assert not processor.is_excluded(Path("vendor/lib.py"))
+
+    processor.exclude_patterns = {"vendor"}
+    assert processor.is_excluded(Path("vendor/lib.py"))
+
+    # Compiled patterns cannot be changed in place without effect
+    with pytest.raises(AttributeError):
+        processor.exclude_patterns.add("docs")
+
+
+@pytest.mark.parametrize(
+    "pattern, name, excluded",
+    [
+        ("notes[1", "notes[1", True),
+        ("notes[1", "notes1", False),
+        ("[]", "[]", True),
+        ("[!]", "[!]", True),
+        ("file[0-9].txt", "file7.txt", True),
+        ("file[0-9].txt", "file[0-9].txt", False),
+        ("[]]x", "]x", True),
+    ],
+)
+def test_exclude_literal_brackets(pattern: str, name: str, excluded: bool) -> None:
+    """Test that only well-formed character classes make a pattern a glob."""
+    processor = DirectoryProcessor({pattern})
+
+    assert processor.is_excluded(Path(name)) is excluded
+    assert fnmatch.fnmatchcase(name, pattern) is excluded
+
+
+def test_exclusion_decisions_are_memoized() -> None:
+    """Test that memoized exclusion decisions stay correct on repeated names."""
+    processor = DirectoryProcessor({"*.pyc", "build"})
+    other = DirectoryProcessor({"*.py"})
+    for _ in range(2):
+        for parent in ("a", "b", "a/b"):
+            assert processor.is_excluded(Path(parent) / "build")
+            assert not processor.is_excluded(Path(parent) / "main.py")
+            assert processor.is_excluded(Path(parent) / "mod.pyc")
+            assert processor.is_excluded(Path("build") / parent / "main.py")
+            assert not processor.is_excluded(Path(parent) / "build.py")
+            # Decisions are not shared between processors
+            assert other.is_excluded(Path(parent) / "main.py")
+            assert not other.is_excluded(Path(parent) / "mod.pyc")
+
+
+def test_iter_files_is_lazy(tmp_path: Path) -> None:
+    """Test that files are yielded before later directories are scanned."""
+    for rel in ["a.txt", "sub/b.txt", "sub/deeper/c.txt"]:
+        (tmp_path / rel).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / rel).write_text(rel)
+
+    processor = DirectoryProcessor(set())
+    with patch("os.scandir", wraps=os.scandir) as mock_scandir:
+        files = processor.iter_files(tmp_path)
+        assert os.path.basename(next(files)) == "a.txt"
+        assert mock_scandir.call_count == 1
+        rest = list(files)
+
+    assert mock_scandir.call_count == 3
+    assert [os.path.basename(entry) for entry in rest] == ["b.txt", "c.txt"]
+    assert [entry.path for entry in processor.scan(tmp_path)[1]] == [
+        os.path.join(tmp_path, "a.txt"),
+        *(entry.path for entry in rest),
+    ]
+
+
+def test_process_directory_calls_back_before_subdirectories_are_scanned(
+    tmp_path: Path,
+) -> None:
+    """Test that process_directory hands over files as the walk reaches them."""
+    for rel in ["a.txt", "sub/b.txt", "sub/deeper/c.txt"]:
+        (tmp_path / rel).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / rel).write_text(rel)
+    scans_seen: list[tuple[str, int]] = []
+
+    processor = DirectoryProcessor(set())
+    with patch("os.scandir", wraps=os.scandir) as mock_scandir:
+        processor.process_directory(
+            tmp_path,
+            lambda entry: scans_seen.append((entry.name, mock_scandir.call_count)),
+        )
+
+    assert scans_seen == [("a.txt", 1), ("b.txt", 2), ("c.txt", 3)]
+
+
+def test_output_file_resolved_once(tmp_path: Path) -> None:
+    """Test that the output file is matched by its absolute path."""
+    processor = DirectoryProcessor(set(), output_file="combined.txt")
+    assert processor.output_file == "combined.txt"
+    assert processor.is_excluded(Path(os.path.abspath("combined.txt")))
+    assert not processor.is_excluded(tmp_path / "combined.txt")
+
+    processor.output_file = None
+    assert not processor.is_excluded(Path("combined.txt"))
+
+
+def test_output_file_created_after_construction(tmp_path: Path) -> None:
+    """Test that an output file created after it was set is still excluded."""
+    (tmp_path / "main.py").write_text("print()")
+    output = tmp_path / "out.md"
+    processor = DirectoryProcessor(set(), output_file=str(output))
+    output.write_text("combined")
+
+    assert [entry.name for entry in processor.iter_files(tmp_path)] == ["main.py"]
+    assert [entry.name for entry in processor.scan(tmp_path)[1]] == ["main.py"]
+    assert "out.md" not in processor.generate_tree(tmp_path)
+
+
+def test_output_file_replaced_between_scans(tmp_path: Path) -> None:
+    """Test that an output file replaced by os.replace is still excluded."""
+    (tmp_path / "main.py").write_text("print()")
+    output = tmp_path / "out.md"
+    output.write_text("first run")
+    processor = DirectoryProcessor(set(), output_file=str(output))
+    assert [entry.name for entry in processor.scan(tmp_path)[1]] == ["main.py"]
+
+    replacement = tmp_path.parent / f"{tmp_path.name}-out.tmp"
+    replacement.write_text("second run")
+    os.replace(replacement, output)
+
+    assert [entry.name for entry in processor.scan(tmp_path)[1]] == ["main.py"]
+    assert [entry.name for entry in processor.iter_files(tmp_path)] == ["main.py"]
+
+
+def test_scan_collects_tree_and_files_in_one_pass(tmp_path: Path) -> None:
+    """Test that a single scan yields the tree and the files to process."""
+    (tmp_path / "pkg").mkdir()
+    (tmp_path / "pkg" / "mod.py").write_text("x = 1")
+    (tmp_path / "main.py").write_text("print()")
+    (tmp_path / "link").symlink_to(tmp_path / "pkg", target_is_directory=True)
+
+    processor = DirectoryProcessor(set())
+    with patch("os.scandir", wraps=os.scandir) as mock_scandir:
+        tree, files = processor.scan(tmp_path)
+
+    assert mock_scandir.call_count == 2
+    assert tree == processor.generate_tree(tmp_path)
+    assert tree.splitlines()[1:] == [
+        "├── link",
+        "├── main.py",
+        "└── pkg",
+        "    └── mod.py",
+    ]
+    assert [os.path.relpath(entry.path, tmp_path) for entry in files] == [
+        "main.py",
+        os.path.join("pkg", "mod.py"),
+    ]
+
+
+def test_scan_skips_existing_output_by_identity(tmp_path: Path) -> None:
+    """Test that an existing output file is matched by device and inode."""
+    output = tmp_path / "combined.out"
+    output.write_text("previous run")
+    (tmp_path / "keep.txt").write_text("keep")
+
+    processor = DirectoryProcessor(set(), output_file=str(output))
+    with patch("os.path.abspath", wraps=os.path.abspath) as mock_abspath:
+        tree, files = processor.scan(tmp_path)
+
+    assert [entry.name for entry in files] == ["keep.txt"]
+    assert "combined.out" not in tree
+    if os.name != "nt":
+        mock_abspath.assert_not_called()
@@ -11,24 +11,17 @@ from click.testing import CliRunner
 
 from filecombinator.cli import main
 from filecombinator.core.combinator import _temp_manager
-from filecombinator.core.config import get_config
-
-
-@pytest.fixture
-def config_suffix() -> str:
-    """Get the configured output file suffix."""
-    return get_config().output_suffix
 
 
 @pytest.fixture(autouse=True)
-def cleanup_temp_files() -> Generator[None, None, None]:
+def cleanup_temp_files(config_suffix: str) -> Generator[None, None, None]:
     """Fixture to ensure temporary files are cleaned up after each test."""
     # Store the original tempdir
     original_tempdir = tempfile.tempdir
 
     # Record initial state of temp directory
     temp_dir = tempfile.gettempdir()
-    suffix = get_config().output_suffix
+    suffix = config_suffix
     before_test = {
         os.path.join(temp_dir, f) for f in os.listdir(temp_dir) if suffix in f
     }
@@ -84,7 +77,7 @@ def test_cli_no_temp_files(config_suffix: str) -> None:
         assert not temp_files, f"Found temporary files: {temp_files}"
 
 
-def test_cli_cleanup_after_error() -> None:
+def test_cli_cleanup_after_error(config_suffix: str) -> None:
     """Test that temporary files are cleaned up even after errors."""
     runner = CliRunner()
 
@@ -93,14 +86,13 @@ def test_cli_cleanup_after_error() -> None:
         assert result.exit_code == 2  # Should fail
 
         # Check for any temporary files
-        temp_files = [f for f in os.listdir(fs) if get_config().output_suffix in f]
+        temp_files = [f for f in os.listdir(fs) if config_suffix in f]
         assert not temp_files, f"Found temporary files after error: {temp_files}"
 
 
-def test_multiple_instances() -> None:
+def test_multiple_instances(config_suffix: str) -> None:
     """Test that multiple FileCombinator instances don't interfere with each other."""
     runner = CliRunner()
-    config_suffix = get_config().output_suffix
 
     with runner.isolated_filesystem() as fs:
         # Create test files
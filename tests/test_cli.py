@@ -1,213 +1,174 @@
 # tests/test_cli.py
 """Test suite for the FileCombinator CLI."""
 
+import logging
 import os
-import tempfile
+import subprocess
+import sys
+from pathlib import Path
 from typing import Any, Generator
 
+import click
 import pytest
 from click.testing import CliRunner
 
 from filecombinator.cli import main
 from filecombinator.core.combinator import FileCombinator
-from filecombinator.core.config import get_config
 from filecombinator.core.exceptions import FileCombinatorError
+from tests.helpers import assert_contains
 
-
-@pytest.fixture
-def config_suffix() -> str:
-    """Get the configured output file suffix."""
-    return get_config().output_suffix
+# Static sample file contents, written as bytes to skip text encoding
+TEXT_PAYLOAD = b"Test content"
+BIN_PAYLOAD = b"\x00\x01"
 
 
-@pytest.fixture
-def test_env() -> Generator[tuple[str, str], None, None]:
-    """Create a test environment with input and output directories.
+@pytest.fixture(scope="session")
+def shared_input(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    """Create a read-only input directory shared by the whole session.
 
     Returns:
-        Tuple of (input directory path, output directory path)
+        Path of the input directory
     """
-    with (
-        tempfile.TemporaryDirectory() as input_dir,
-        tempfile.TemporaryDirectory() as output_dir,
-    ):
-        # Create some test files
-        with open(os.path.join(input_dir, "test.txt"), "w") as f:
-            f.write("Test content")
-        with open(os.path.join(input_dir, "test.bin"), "wb") as f:
-            f.write(b"\x00\x01")
-
-        yield input_dir, output_dir
+    input_dir = tmp_path_factory.mktemp("fc_in")
+    (input_dir / "test.txt").write_bytes(TEXT_PAYLOAD)
+    (input_dir / "test.bin").write_bytes(BIN_PAYLOAD)
+    for name, content in [
+        ("exclude_me", b"Should be excluded"),
+        ("exclude1", b"Content in exclude1"),
+        ("exclude2", b"Content in exclude2"),
+    ]:
+        (input_dir / name).mkdir()
+        (input_dir / name / "test.txt").write_bytes(content)
+    return input_dir
+
+
+def run_cli(argv: list[str]) -> None:
+    """Run the CLI in-process, without Click's standalone exit handling.
+
+    Args:
+        argv: Command line arguments
+    """
+    try:
+        main.main(argv, prog_name="filecombinator", standalone_mode=False)
+    except SystemExit as e:
+        assert e.code in (None, 0)
 
 
-def test_cli_defaults(config_suffix: str) -> None:
+def test_cli_defaults(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, config_suffix: str
+) -> None:
     """Test CLI with default values."""
-    runner = CliRunner()
-    with runner.isolated_filesystem():
-        # Create a test file
-        os.makedirs("testdir")
-        with open(os.path.join("testdir", "test.txt"), "w") as f:
-            f.write("Test content")
+    monkeypatch.chdir(tmp_path)
 
-        # Test with default output filename
-        result = runner.invoke(main, ["-d", "testdir"])
-        assert result.exit_code == 0
+    # Create a test file
+    (tmp_path / "testdir").mkdir()
+    (tmp_path / "testdir" / "test.txt").write_bytes(TEXT_PAYLOAD)
 
-        # Check for default output file
-        expected_output = f"testdir{config_suffix}"
-        assert os.path.exists(expected_output)
+    # Test with default output filename
+    run_cli(["-d", "testdir"])
 
-        # Verify content
-        with open(expected_output, "r") as f:
-            content = f.read()
-            assert "test.txt" in content
-            assert "Test content" in content
+    # Check the default output file and its content
+    expected_output = tmp_path / f"testdir{config_suffix}"
+    assert_contains(expected_output, must=["test.txt", "Test content"])
 
 
-def test_cli_default_output_current_dir(config_suffix: str) -> None:
+def test_cli_default_output_current_dir(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, config_suffix: str
+) -> None:
     """Test CLI with default output filename in current directory."""
-    runner = CliRunner()
-    with runner.isolated_filesystem():
-        # Create test file in current directory
-        with open("test.txt", "w") as f:
-            f.write("Test content")
-
-        # Run with current directory
-        result = runner.invoke(main)
-        assert result.exit_code == 0
-
-        # Get current directory name
-        current_dir = os.path.basename(os.path.abspath("."))
-        expected_output = f"{current_dir}{config_suffix}"
-        assert os.path.exists(expected_output)
-
-        # Verify content
-        with open(expected_output, "r") as f:
-            content = f.read()
-            assert "test.txt" in content
-            assert "Test content" in content
-
-
-def test_cli_custom_directory(test_env: tuple[str, str], config_suffix: str) -> None:
-    """Test CLI with custom input directory."""
-    input_dir, output_dir = test_env
-    runner = CliRunner()
-
-    # Use explicit output file in output directory
-    output_file = os.path.join(output_dir, "output" + config_suffix)
-    result = runner.invoke(main, ["--directory", input_dir, "--output", output_file])
-
-    assert result.exit_code == 0
-    assert os.path.exists(output_file)
-
-
-def test_cli_custom_output(test_env: tuple[str, str], config_suffix: str) -> None:
-    """Test CLI with custom output file."""
-    input_dir, output_dir = test_env
-    output_file = os.path.join(output_dir, "custom" + config_suffix)
-
-    runner = CliRunner()
-    result = runner.invoke(main, ["--directory", input_dir, "--output", output_file])
-    assert result.exit_code == 0
-    assert os.path.exists(output_file)
-
-
-def test_cli_exclude_patterns(test_env: tuple[str, str], config_suffix: str) -> None:
-    """Test CLI with exclude patterns."""
-    input_dir, output_dir = test_env
-
-    # Create a directory that should be excluded
-    exclude_dir = os.path.join(input_dir, "exclude_me")
-    os.makedirs(exclude_dir)
-    with open(os.path.join(exclude_dir, "test.txt"), "w") as f:
-        f.write("Should be excluded")
-
-    runner = CliRunner()
-    output_file = os.path.join(output_dir, "output" + config_suffix)
-    result = runner.invoke(
-        main,
-        ["--directory", input_dir, "--exclude", "exclude_me", "--output", output_file],
-    )
-    assert result.exit_code == 0
-
-    # Check output doesn't contain excluded content
-    with open(output_file) as f:
-        content = f.read()
-        assert "exclude_me" not in content
-        assert "Should be excluded" not in content
-
-
-def test_cli_multiple_excludes(test_env: tuple[str, str], config_suffix: str) -> None:
-    """Test CLI with multiple exclude patterns."""
-    input_dir, output_dir = test_env
-
-    # Create directories that should be excluded
-    for exclude_dir in ["exclude1", "exclude2"]:
-        full_path = os.path.join(input_dir, exclude_dir)
-        os.makedirs(full_path)
-        with open(os.path.join(full_path, "test.txt"), "w") as f:
-            f.write(f"Content in {exclude_dir}")
-
-    output_file = os.path.join(output_dir, "output" + config_suffix)
-    runner = CliRunner()
-    result = runner.invoke(
-        main,
-        [
-            "--directory",
-            input_dir,
-            "--exclude",
-            "exclude1",
-            "--exclude",
-            "exclude2",
-            "--output",
-            output_file,
-        ],
-    )
-    assert result.exit_code == 0
-
-    with open(output_file) as f:
-        content = f.read()
-        assert "exclude1" not in content
-        assert "exclude2" not in content
+    monkeypatch.chdir(tmp_path)
+
+    # Create test file in current directory
+    (tmp_path / "test.txt").write_bytes(TEXT_PAYLOAD)
+
+    # Run with current directory
+    run_cli([])
+
+    # Output is named after the current directory
+    expected_output = tmp_path / f"{tmp_path.name}{config_suffix}"
+    assert_contains(expected_output, must=["test.txt", "Test content"])
+
+
+@pytest.mark.parametrize(
+    "excludes,must_contain,must_not_contain",
+    [
+        pytest.param(
+            (),
+            ["Test content", "Should be excluded", "Content in exclude1"],
+            [],
+            id="no-excludes",
+        ),
+        pytest.param(
+            ("exclude_me",),
+            ["Test content", "Content in exclude1"],
+            ["exclude_me", "Should be excluded"],
+            id="single-exclude",
+        ),
+        pytest.param(
+            ("exclude1", "exclude2"),
+            ["Test content", "Should be excluded"],
+            ["exclude1", "exclude2"],
+            id="multiple-excludes",
+        ),
+    ],
+)
+def test_cli_matrix(
+    shared_input: Path,
+    tmp_path: Path,
+    config_suffix: str,
+    excludes: tuple[str, ...],
+    must_contain: list[str],
+    must_not_contain: list[str],
+) -> None:
+    """Test combining the shared input with different -e/--exclude options."""
+    output_file = os.path.join(tmp_path, "output" + config_suffix)
+    argv = ["-d", str(shared_input), "-o", output_file, "--no-style"]
+    for pattern in excludes:
+        argv += ["-e", pattern]
+    run_cli(argv)
 
+    assert_contains(output_file, must=must_contain, must_not=must_not_contain)
 
-def test_cli_verbose_output(test_env: tuple[str, str], config_suffix: str) -> None:
-    """Test CLI with verbose output."""
-    input_dir, output_dir = test_env
-    output_file = os.path.join(output_dir, "output" + config_suffix)
 
-    runner = CliRunner(mix_stderr=False)
-    result = runner.invoke(
-        main,
-        [
-            "--directory",
-            input_dir,
-            "--verbose",
-            "--no-style",
-            "--output",
-            output_file,
-        ],
-        catch_exceptions=False,
-    )
-    assert result.exit_code == 0
-
-    # Let's check both stdout and stderr individually
-    debug_messages = [
-        "Created temporary file:",
-        "Starting directory processing:",
-        "Processing completed in",
-        "Text files processed:",
+@pytest.fixture
+def default_log_levels() -> Generator[None, None, None]:
+    """Leave log filtering to the CLI's root level, then restore logging."""
+    package_logger = logging.getLogger("FileCombinator")
+    root = logging.getLogger()
+    saved = package_logger.level, root.level, root.handlers
+    package_logger.setLevel(logging.NOTSET)
+    yield
+    package_logger.setLevel(saved[0])
+    root.setLevel(saved[1])
+    root.handlers = saved[2]
+
+
+@pytest.mark.usefixtures("default_log_levels")
+@pytest.mark.parametrize("verbose", [False, True])
+def test_cli_verbose_output(
+    shared_input: Path, tmp_path: Path, config_suffix: str, verbose: bool
+) -> None:
+    """Test that --verbose, and only --verbose, logs debug messages."""
+    argv = [
+        "--directory",
+        str(shared_input),
+        "--output",
+        os.path.join(tmp_path, "output" + config_suffix),
+        "--no-style",
     ]
+    if verbose:
+        argv.append("--verbose")
+    result = CliRunner().invoke(main, argv)
 
-    combined_output = (result.stdout or "") + (result.stderr or "")
-
-    for msg in debug_messages:
-        assert msg in combined_output
+    assert result.exit_code == 0
+    assert ("Created temporary file:" in result.output) is verbose
+    for msg in ["Starting directory processing:", "Text files processed:"]:
+        assert msg in result.output
 
 
 def test_cli_error_handling(config_suffix: str) -> None:
     """Test CLI error handling with nonexistent directory."""
-    runner = CliRunner(mix_stderr=False)
+    runner = CliRunner()
     with runner.isolated_filesystem() as fs:
         output_file = os.path.join(fs, "output" + config_suffix)
         result = runner.invoke(
@@ -218,33 +179,28 @@ def test_cli_error_handling(config_suffix: str) -> None:
         assert result.exit_code == 2  # System exit for fatal errors
         # Just verify it contains error indication
         assert any(
-            error_text in (result.stderr or "")
+            error_text in result.output
             for error_text in ["Error", "does not exist", "nonexistent"]
         )
 
 
-def test_cli_help() -> None:
-    """Test CLI help output."""
-    runner = CliRunner()
-    result = runner.invoke(main, ["--help"])
-    assert result.exit_code == 0
-    # Just verify essential help content
-    assert "Usage:" in result.output
-    assert "-d, --directory" in result.output
-    assert "-o, --output" in result.output
-
+def test_cli_metadata() -> None:
+    """Test CLI help content and version option without invoking the CLI."""
+    help_text = main.get_help(click.Context(main, info_name="filecombinator"))
 
-def test_cli_version() -> None:
-    """Test CLI version output."""
-    runner = CliRunner()
-    result = runner.invoke(main, ["--version"])
-    assert result.exit_code == 0
-    assert "version" in result.output.lower()
+    # Just verify essential help content
+    assert "Usage:" in help_text
+    assert "-d, --directory" in help_text
+    assert "-o, --output" in help_text
+    assert "--version" in help_text
+    assert any(param.name == "version" for param in main.params)
 
 
-def test_cli_output_without_tty(test_env: tuple[str, str], config_suffix: str) -> None:
+def test_cli_output_without_tty(
+    shared_input: Path, tmp_path: Path, config_suffix: str
+) -> None:
     """Test CLI output without a TTY (e.g., in a pipeline)."""
-    input_dir, output_dir = test_env
+    input_dir = str(shared_input)
     runner = CliRunner()
 
     # Force non-TTY mode
@@ -254,7 +210,7 @@ def test_cli_output_without_tty(test_env: tuple[str, str], config_suffix: str) -
             "--directory",
             input_dir,
             "--output",
-            os.path.join(output_dir, "output" + config_suffix),
+            os.path.join(tmp_path, "output" + config_suffix),
             "--no-style",  # Disable rich styling
         ],
         color=False,
@@ -265,31 +221,19 @@ def test_cli_output_without_tty(test_env: tuple[str, str], config_suffix: str) -
 
 
 def test_cli_existing_output_file_no_tty(
-    test_env: tuple[str, str], config_suffix: str
+    shared_input: Path, tmp_path: Path, config_suffix: str
 ) -> None:
     """Test handling of existing output file without TTY."""
-    input_dir, output_dir = test_env
-    output_file = os.path.join(output_dir, "existing" + config_suffix)
+    input_dir = str(shared_input)
+    output_file = os.path.join(tmp_path, "existing" + config_suffix)
 
     # Create existing output file
-    with open(output_file, "w") as f:
-        f.write("existing content")
+    Path(output_file).write_text("existing content")
 
-    runner = CliRunner()
-    result = runner.invoke(
-        main,
-        [
-            "--directory",
-            input_dir,
-            "--output",
-            output_file,
-        ],
-        color=False,
-    )
+    run_cli(["--directory", input_dir, "--output", output_file])
 
-    assert result.exit_code == 0
-    # Should proceed without prompting in non-TTY mode
-    assert os.path.exists(output_file)
+    # Should overwrite without prompting in non-TTY mode
+    assert_contains(output_file, must=["Test content"], must_not=["existing content"])
 
 
 def test_cli_unexpected_error(monkeypatch: pytest.MonkeyPatch) -> None:
@@ -301,9 +245,8 @@ def test_cli_unexpected_error(monkeypatch: pytest.MonkeyPatch) -> None:
     runner = CliRunner()
     with runner.isolated_filesystem():
         # Create a test file
-        os.makedirs("test_dir")
-        with open(os.path.join("test_dir", "test.txt"), "w") as f:
-            f.write("test")
+        Path("test_dir").mkdir()
+        Path("test_dir", "test.txt").write_text("test")
 
         monkeypatch.setattr(FileCombinator, "process_directory", mock_process_directory)
 
@@ -312,12 +255,14 @@ def test_cli_unexpected_error(monkeypatch: pytest.MonkeyPatch) -> None:
         assert "Unexpected error: Unexpected test error" in result.output
 
 
-def test_cli_verbose_logging(test_env: tuple[str, str], config_suffix: str) -> None:
+def test_cli_verbose_logging(
+    shared_input: Path, tmp_path: Path, config_suffix: str
+) -> None:
     """Test CLI with verbose logging enabled."""
-    input_dir, output_dir = test_env
+    input_dir = str(shared_input)
 
     # Create a file to process
-    runner = CliRunner(mix_stderr=False)
+    runner = CliRunner()
     result = runner.invoke(
         main,
         [
@@ -325,23 +270,22 @@ def test_cli_verbose_logging(test_env: tuple[str, str], config_suffix: str) -> N
             input_dir,
             "--verbose",
             "--output",
-            os.path.join(output_dir, "output" + config_suffix),
+            os.path.join(tmp_path, "output" + config_suffix),
         ],
     )
 
     assert result.exit_code == 0
-    # Verify log messages in combined output
-    combined_output = (result.stdout or "") + (result.stderr or "")
-    assert "Starting directory processing" in combined_output
-    assert "Processing completed" in combined_output
+    # Log messages land in the mixed stdout/stderr output
+    assert "Starting directory processing" in result.output
+    assert "Processing completed" in result.output
 
 
 def test_cli_stderr_setup_error(
-    test_env: tuple[str, str], monkeypatch: pytest.MonkeyPatch
+    shared_input: Path, monkeypatch: pytest.MonkeyPatch
 ) -> None:
     """Test CLI handling of setup errors."""
-    input_dir, _ = test_env
-    runner = CliRunner(mix_stderr=False)
+    input_dir = str(shared_input)
+    runner = CliRunner()
 
     # Mock our specific setup_logging function instead of global getLogger
     def mock_setup(*args: Any, **kwargs: Any) -> None:
@@ -351,15 +295,13 @@ def test_cli_stderr_setup_error(
 
     result = runner.invoke(main, ["-d", input_dir])
     assert result.exit_code == 2
-    assert "Test setup error" in (result.stderr or "")
+    assert "Test setup error" in result.output
 
 
-def test_cli_error_logging(
-    test_env: tuple[str, str], monkeypatch: pytest.MonkeyPatch
-) -> None:
+def test_cli_error_logging(shared_input: Path, monkeypatch: pytest.MonkeyPatch) -> None:
     """Test CLI error logging."""
-    input_dir, _ = test_env
-    runner = CliRunner(mix_stderr=False)
+    input_dir = str(shared_input)
+    runner = CliRunner()
 
     def mock_process(*args: Any, **kwargs: Any) -> None:
         # Raise a specific error that cli.py handles
@@ -370,36 +312,10 @@ def test_cli_error_logging(
 
     result = runner.invoke(main, ["--directory", input_dir, "--verbose"])
     assert result.exit_code == 2
-    assert "Test processing error" in (result.stderr or "")
-
-
-def test_cli_verbose_setup(test_env: tuple[str, str], config_suffix: str) -> None:
-    """Test CLI setup with verbose logging."""
-    input_dir, output_dir = test_env
-    runner = CliRunner(mix_stderr=False)
-
-    result = runner.invoke(
-        main,
-        [
-            "--directory",
-            input_dir,
-            "--verbose",
-            "--output",
-            os.path.join(output_dir, "output" + config_suffix),
-            "--no-style",  # Disable rich styling to make output checking easier
-        ],
-    )
-
-    assert result.exit_code == 0
-    # Check for debug messages that should only appear with verbose flag
-    combined_output = (result.stdout or "") + (result.stderr or "")
-    assert "Starting directory processing" in combined_output
-    assert "Created temporary file" in combined_output
+    assert "Test processing error" in result.output
 
 
-def test_cli_tty_file_overwrite_cancel(
-    test_env: tuple[str, str], monkeypatch: pytest.MonkeyPatch
-) -> None:
+def test_cli_tty_file_overwrite_cancel(monkeypatch: pytest.MonkeyPatch) -> None:
     """Test canceling file overwrite in TTY mode."""
     # Track mock calls
     confirm_called = False
@@ -423,12 +339,10 @@ def test_cli_tty_file_overwrite_cancel(
     runner = CliRunner()
     with runner.isolated_filesystem():
         # Create test files
-        os.makedirs("test_dir")
-        with open(os.path.join("test_dir", "test.txt"), "w") as f:
-            f.write("test content")
+        Path("test_dir").mkdir()
+        Path("test_dir", "test.txt").write_text("test content")
 
-        with open("output.md", "w") as f:
-            f.write("existing content")
+        Path("output.md").write_text("existing content")
 
         # Run command
         result = runner.invoke(
@@ -443,3 +357,28 @@ def test_cli_tty_file_overwrite_cancel(
         # Verify file wasn't changed
         with open("output.md") as f:
             assert f.read() == "existing content"
+
+
+def test_cli_no_style_skips_rich(
+    shared_input: Path, tmp_path: Path, config_suffix: str
+) -> None:
+    """Test that unstyled runs never import Rich."""
+    input_dir = str(shared_input)
+    output_file = os.path.join(tmp_path, "plain" + config_suffix)
+    script = (
+        "import sys\n"
+        "from filecombinator.cli import main\n"
+        "try:\n"
+        f"    main(['-d', {input_dir!r}, '-o', {output_file!r}, '--no-style'])\n"
+        "except SystemExit as e:\n"
+        "    assert not e.code, e.code\n"
+        "print(sorted(m for m in sys.modules if m.split('.')[0] == 'rich'))\n"
+    )
+
+    result = subprocess.run(
+        [sys.executable, "-c", script], capture_output=True, text=True, check=True
+    )
+
+    assert result.stdout.splitlines()[-1] == "[]"
+    assert "✓ " in result.stdout
+    assert os.path.exists(output_file)
@@ -7,6 +7,7 @@ from pathlib import Path
 import pytest
 
 from filecombinator.core.config import get_config
+from tests.helpers import assert_contains
 
 
 @pytest.fixture
@@ -28,8 +29,7 @@ def test_dir(tmp_path: Path) -> Path:
     (venv_dir / "lib").write_text("exclude me")
 
     # Create binary file
-    with open(proj_dir / "test.bin", "wb") as f:
-        f.write(b"\x00\x01\x02\x03")
+    (proj_dir / "test.bin").write_bytes(b"\x00\x01\x02\x03")
 
     return proj_dir
 
@@ -74,23 +74,22 @@ def test_cli(
 
         # Check output file
         output_file = f"test_proj{get_config().output_suffix}"
-        assert os.path.exists(output_file)
 
-        # Check content
-        content = Path(output_file).read_text()
-
-        # Structure checks
-        assert "Directory Structure" in content
-        assert "test_proj/" in content
-        assert "src" in content
-        assert ".venv" not in content
-
-        # File checks
-        assert "def main():" in content
-        assert "def util():" in content
-        assert "**Type**: Binary" in content
-        assert "**Type**: Text" in content
-        assert "*Content excluded: Binary file*" in content
+        # Structure and file checks
+        assert_contains(
+            output_file,
+            must=[
+                "Directory Structure",
+                "test_proj/",
+                "src",
+                "def main():",
+                "def util():",
+                "**Type**: Binary",
+                "**Type**: Text",
+                "*Content excluded: Binary file*",
+            ],
+            must_not=[".venv"],
+        )
 
     finally:
         os.chdir(orig_dir)
@@ -126,11 +125,9 @@ def test_cli_exclude(test_dir: Path) -> None:
         assert result.returncode == 0
 
         output_file = f"test_proj{get_config().output_suffix}"
-        content = Path(output_file).read_text()
-
-        assert "src/main.py" not in content
-        assert "test.bin" in content
-        assert ".venv" not in content
+        assert_contains(
+            output_file, must=["test.bin"], must_not=["src/main.py", ".venv"]
+        )
 
     finally:
         os.chdir(orig_dir)